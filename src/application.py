@@ -17,18 +17,18 @@ class MainWidget(QtWidgets.QWidget):
 
     def __init__(self):
         super(MainWidget, self).__init__()
-        widgets = Widgets()
-        self.update_thread = GUIThread(widgets)
+        self.widgets = Widgets()
+        self.update_thread = GUIThread(self.widgets)
 
         splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Horizontal)
         splitter.setChildrenCollapsible(False)
         splitter.setStyleSheet(self.STYLESHEET)
-        splitter.addWidget(widgets.connection_widget)
-        splitter.addWidget(widgets.profile_widget)
+        splitter.addWidget(self.widgets.connection_widget)
+        splitter.addWidget(self.widgets.profile_widget)
 
         layout = QtWidgets.QVBoxLayout()
         layout.addWidget(splitter)
-        layout.addWidget(widgets.pad_widget)
+        layout.addWidget(self.widgets.pad_widget)
         self.setLayout(layout)
 
 
@@ -59,16 +59,19 @@ class MainApplication(QtWidgets.QApplication):
     REFLEX_PURPLE = {"primary": "#ad02ff"}
 
     ICON_PATH = "../assets/favicon.ico"
+    QUIT_TIMEOUT_SECS = 2.0
 
     def __init__(self):
         super(MainApplication, self).__init__(sys.argv)
-        self.set_opengl_doublebuffering()
+        self.set_opengl_format()
         self.set_application_theme()
         self.window = MainWindow()
         self.setup_interface()
 
     def setup_interface(self) -> None:
         self._data_proc = DataProcess()
+        pad_widget = self.window.widget.widgets.pad_widget
+        pad_widget.snapshot = self._data_proc.snapshot
         self.window.widget.update_thread.tx_queue = self._data_proc.rx_queue
         self.window.widget.update_thread.rx_queue = self._data_proc.tx_queue
         self._data_proc.start()
@@ -76,8 +79,11 @@ class MainApplication(QtWidgets.QApplication):
         self.aboutToQuit.connect(self.cleanup)
 
     @staticmethod
-    def set_opengl_doublebuffering() -> None:
+    def set_opengl_format() -> None:
         format = QtGui.QSurfaceFormat()
+        format.setVersion(3, 3)
+        profile = QtGui.QSurfaceFormat.OpenGLContextProfile.CoreProfile
+        format.setProfile(profile)
         format.setSwapInterval(1)
         format.setSwapBehavior(QtGui.QSurfaceFormat.SwapBehavior.DoubleBuffer)
         QtGui.QSurfaceFormat.setDefaultFormat(format)
@@ -91,8 +97,11 @@ class MainApplication(QtWidgets.QApplication):
         self.setPalette(palette)
 
     def cleanup(self) -> None:
-        self._data_proc.terminate()
-        self._data_proc.join()
+        self._data_proc.join(self.QUIT_TIMEOUT_SECS)
+        if self._data_proc.is_alive():
+            self._data_proc.terminate()
+            self._data_proc.join()
+        self._data_proc.snapshot.close()
         self.quit()
 
 
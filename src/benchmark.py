@@ -0,0 +1,283 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import pathlib
+import sys
+import tempfile
+import timeit
+from typing import Callable
+
+import numpy as np
+
+from led_data_generator import LEDDataGenerator
+from led_data_handler import LEDDataHandler
+from lighting_engine import LightingEngine
+from pad_model import BaselineTracker, PadModel
+from pad_snapshot import PadSnapshot
+from pad_widget_gl import Rect
+from pad_widget_view import PanelPainter
+from profile_controller import ProfileController
+from reflex_controller import ReflexController
+from sensor_data_handler import SensorDataHandler
+from sensor_filter import SensorFilter
+from usb_controller import USBDeviceList
+from usb_simulator import SimulatedBackend
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(__file__), "benchmark_baseline.json"
+)
+REPORT_BYTES = 64
+BLOCK_REPORTS = 16
+REPEATS = 9
+TOLERANCE = 0.25
+
+Case = Callable[[list], Callable[[], None]]
+
+
+def sensor_reports(num_reports: int, seed: int = 0) -> np.ndarray:
+    generator = np.random.default_rng(seed)
+    values = generator.integers(300, 700, (num_reports, 16), np.uint16)
+    reports = np.zeros((num_reports, REPORT_BYTES), np.uint8)
+    reports[:, 0:32:2] = values & 0xFF
+    reports[:, 1:32:2] = values >> 8
+    return reports
+
+
+def sensor_samples(num_reports: int) -> np.ndarray:
+    return SensorDataHandler.organise_sensor_data(sensor_reports(num_reports))
+
+
+def case_organise_sensor_data(cleanup: list) -> Callable[[], None]:
+    reports = sensor_reports(BLOCK_REPORTS)
+    return lambda: SensorDataHandler.organise_sensor_data(reports)
+
+
+def case_set_sensor_values(cleanup: list) -> Callable[[], None]:
+    model = PadModel()
+    samples = sensor_samples(BLOCK_REPORTS)
+    model.set_baseline_values(samples[0])
+    return lambda: model.set_sensor_values(samples)
+
+
+def case_set_sensor_data(cleanup: list) -> Callable[[], None]:
+    model = PadModel()
+    data = SensorDataHandler.sample_to_pad_data(sensor_samples(1)[0])
+    model.set_baseline(data)
+    return lambda: model.set_sensor_data(data)
+
+
+def case_set_baseline(cleanup: list) -> Callable[[], None]:
+    model = PadModel()
+    data = SensorDataHandler.sample_to_pad_data(sensor_samples(1)[0])
+    return lambda: model.set_baseline(data)
+
+
+def case_baseline_tracking(cleanup: list) -> Callable[[], None]:
+    entry = PadModel().get_model_data()
+    tracker = BaselineTracker(entry.base)
+    values = sensor_samples(1).reshape(1, *entry.base.shape)
+    released = np.ones(values.shape, np.bool_)
+    return lambda: tracker.update(entry, values, released)
+
+
+def filter_case(config: dict) -> Case:
+    def case(cleanup: list) -> Callable[[], None]:
+        sensor_filter = SensorFilter.create(config)
+        samples = sensor_samples(BLOCK_REPORTS)
+        return lambda: sensor_filter.process(samples)
+    return case
+
+
+def case_give_sample(cleanup: list) -> Callable[[], None]:
+    model = PadModel()
+    data = multiprocessing.Array('B', REPORT_BYTES)
+    event = multiprocessing.Event()
+    lights = LEDDataHandler(data, event, model, LightingEngine(model))
+
+    def give_sample() -> None:
+        event.set()
+        lights.give_sample()
+    return give_sample
+
+
+def case_render_lights(cleanup: list) -> Callable[[], None]:
+    model = PadModel()
+    engine = LightingEngine(model)
+    engine.subscribe(LEDDataGenerator(model.get_led_array().shape))
+    return engine.render
+
+
+def case_snapshot_publish(cleanup: list) -> Callable[[], None]:
+    model = PadModel()
+    snapshot = PadSnapshot()
+    cleanup.append(snapshot.close)
+    entry = model.get_model_data()
+
+    def publish() -> None:
+        entry.leds[0, 0, 0, 0] ^= 1
+        snapshot.publish(entry)
+    return publish
+
+
+def case_snapshot_unchanged(cleanup: list) -> Callable[[], None]:
+    model = PadModel()
+    snapshot = PadSnapshot()
+    cleanup.append(snapshot.close)
+    snapshot.publish(model.get_model_data())
+    return lambda: snapshot.publish(model.get_model_data())
+
+
+def case_snapshot_read(cleanup: list) -> Callable[[], None]:
+    model = PadModel()
+    snapshot = PadSnapshot()
+    cleanup.append(snapshot.close)
+    snapshot.publish(model.get_model_data())
+    return lambda: snapshot.read_into(model.get_model_data())
+
+
+def case_rect_instances(cleanup: list) -> Callable[[], None]:
+    entry = PadModel().get_model_data()
+    background, rect = Rect(), Rect()
+    painters = [
+        PanelPainter(coord, data, entry, background, rect)
+        for coord, data in entry.panels.items()
+    ]
+
+    def fill_instances() -> None:
+        for painter in painters:
+            painter.draw()
+    return fill_instances
+
+
+def profile_controller(cleanup: list) -> ProfileController:
+    USBDeviceList.backend = SimulatedBackend(num_pads=0)
+    directory = tempfile.TemporaryDirectory()
+    cleanup.append(directory.cleanup)
+    controller = ProfileController(ReflexController())
+    controller.profile_path = pathlib.Path(directory.name)
+    asyncio.run(controller.initialise_profile())
+    cleanup.append(controller.flush_profiles)
+    return controller
+
+
+def case_profile_save(cleanup: list) -> Callable[[], None]:
+    controller = profile_controller(cleanup)
+    name = controller.get_profile_names()[0]
+    return lambda: controller.save_user_profile(name)
+
+
+def case_profile_load(cleanup: list) -> Callable[[], None]:
+    controller = profile_controller(cleanup)
+    name = controller.get_profile_names()[0]
+    return lambda: controller.apply_user_profile(
+        name, controller.store.load(name)
+    )
+
+
+CASES: dict[str, Case] = {
+    "organise_sensor_data": case_organise_sensor_data,
+    "set_sensor_values": case_set_sensor_values,
+    "set_sensor_data": case_set_sensor_data,
+    "set_baseline": case_set_baseline,
+    "baseline_tracking": case_baseline_tracking,
+    "filter_median": filter_case({"type": "median", "size": 5}),
+    "filter_iir": filter_case({"type": "iir", "alpha": 0.25}),
+    "filter_slope": filter_case({"type": "slope", "max_step": 64}),
+    "give_sample": case_give_sample,
+    "render_lights": case_render_lights,
+    "snapshot_publish": case_snapshot_publish,
+    "snapshot_unchanged": case_snapshot_unchanged,
+    "snapshot_read": case_snapshot_read,
+    "rect_instances": case_rect_instances,
+    "profile_save": case_profile_save,
+    "profile_load": case_profile_load
+}
+
+
+def measure(function: Callable[[], None], repeats: int = REPEATS) -> float:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeats, number)) / number * 1e6
+
+
+def run_benchmarks(
+    names: list[str] | None = None, runs: int = 1
+) -> dict[str, float]:
+    results = {}
+    for _ in range(max(runs, 1)):
+        for name in names or CASES:
+            cleanup = []
+            try:
+                value = measure(CASES[name](cleanup))
+            finally:
+                for close in reversed(cleanup):
+                    close()
+            results[name] = min(value, results.get(name, value))
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float],
+    tolerance: float = TOLERANCE
+) -> tuple[list[str], list[str]]:
+    lines = [f"{'case':<24}{'base us':>12}{'now us':>12}{'change':>10}"]
+    regressions = []
+    for name, value in results.items():
+        if (base := baseline.get(name)) is None:
+            lines.append(f"{name:<24}{'-':>12}{value:>12.2f}{'new':>10}")
+            continue
+        change = value / base - 1.0
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(
+            f"{name:<24}{base:>12.2f}{value:>12.2f}{change:>+10.1%}{flag}"
+        )
+    return lines, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Microbenchmarks for the pad data path hot spots. "
+        "Timings are machine specific, so compare against a baseline "
+        "saved on the same machine."
+    )
+    parser.add_argument("cases", nargs="*", metavar="case")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save", action="store_true",
+        help="store these results as the baseline"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=TOLERANCE,
+        help="slowdown fraction reported as a regression"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=1,
+        help="repeat the suite and keep the best time of each case"
+    )
+    args = parser.parse_args()
+    if unknown := set(args.cases) - set(CASES):
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = run_benchmarks(args.cases, args.runs)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print("\n".join(lines))
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
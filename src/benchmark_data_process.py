@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+
+from data_sequences import Sequences
+from key_output import KeyOutput, RecordingBackend
+from pad_model import PadModel
+from sensor_recording import SensorRecording, SensorReplay
+from usb_controller import USBDeviceList
+from usb_simulator import SimulatedBackend
+
+
+def measure_data_process(duration: float, num_pads: int) -> None:
+    os.environ[KeyOutput.BACKEND_ENV] = RecordingBackend.NAME
+    USBDeviceList.backend = SimulatedBackend(num_pads)
+    sequences = Sequences()
+    controller = sequences.pad_controller
+    controller.enumerate_pads()
+    for serial in controller.get_all_pads():
+        controller.connect_pad(serial)
+    frames = 0
+    end = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < end:
+            if controller.notify.wait(0.1):
+                controller.notify.clear()
+                sequences.handle_pad_data()
+                frames += 1
+        latency, _ = controller.collect_latency()
+        print(f"frames/s:          {frames / duration:12.1f}")
+        reports = latency.summary()["handoff"]["count"]
+        print(f"reports/s:         {reports / duration:12.1f}")
+        print(controller.report_latency())
+    finally:
+        controller.disconnect_pad()
+
+
+def measure_replay(path: str, speed: float, block: int) -> None:
+    recording = SensorRecording(path)
+    model = PadModel()
+    backend = RecordingBackend()
+    model.key_output = KeyOutput(backend)
+    replay = SensorReplay(recording, model, speed, block)
+    start = time.perf_counter()
+    try:
+        rows, _, pressed = replay.run()
+    finally:
+        elapsed = time.perf_counter() - start
+        replay.close()
+        model.key_output.close()
+    print(f"reports:           {len(recording):12d}")
+    print(f"reports/s:         {len(recording) / elapsed:12.1f}")
+    print(f"presses:           {int(pressed.sum()):12d}")
+    print(f"releases:          {int((~pressed).sum()):12d}")
+    print(f"key events:        {len(backend.events):12d}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "replay":
+        speed = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+        block = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+        measure_replay(sys.argv[2], speed, block)
+    else:
+        duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+        num_pads = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+        measure_data_process(duration, num_pads)
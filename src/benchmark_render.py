@@ -0,0 +1,207 @@
+import os
+
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import argparse
+import ctypes
+import pathlib
+import sys
+import time
+
+import numpy as np
+import OpenGL.EGL as EGL
+import OpenGL.GL as GL
+import PIL.Image as Image
+
+from led_data_generator import LEDDataGenerator
+from lighting_engine import LightingEngine
+from pad_model import PadEntry, PadModel
+from pad_widget_view import PadWidgetView
+
+
+class HeadlessContext:
+    """Surfaceless EGL context drawing into an offscreen framebuffer."""
+
+    def __init__(self, width: int, height: int, core: bool = True):
+        self.width = width
+        self.height = height
+        self._display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(
+            self._display, ctypes.pointer(major), ctypes.pointer(minor)
+        ):
+            raise RuntimeError("Could not initialise an EGL display.")
+        config_attribs = self.attrib_list(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT
+        )
+        config, num_configs = EGL.EGLConfig(), EGL.EGLint()
+        EGL.eglChooseConfig(
+            self._display, config_attribs, ctypes.pointer(config), 1,
+            ctypes.pointer(num_configs)
+        )
+        if num_configs.value == 0:
+            raise RuntimeError("No EGL config supports desktop OpenGL.")
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context_attribs = self.attrib_list(
+            EGL.EGL_CONTEXT_MAJOR_VERSION, 3,
+            EGL.EGL_CONTEXT_MINOR_VERSION, 3,
+            EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK,
+            EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT
+        ) if core else self.attrib_list()
+        self._context = EGL.eglCreateContext(
+            self._display, config, EGL.EGL_NO_CONTEXT, context_attribs
+        )
+        if not self._context:
+            raise RuntimeError("Could not create an OpenGL context.")
+        EGL.eglMakeCurrent(
+            self._display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE,
+            self._context
+        )
+        self._renderbuffer = GL.glGenRenderbuffers(1)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, self._renderbuffer)
+        GL.glRenderbufferStorage(
+            GL.GL_RENDERBUFFER, GL.GL_RGBA8, width, height
+        )
+        self.framebuffer = GL.glGenFramebuffers(1)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self.framebuffer)
+        GL.glFramebufferRenderbuffer(
+            GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_RENDERBUFFER,
+            self._renderbuffer
+        )
+        status = GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER)
+        if status != GL.GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f"Framebuffer incomplete: {status:#x}.")
+
+    @staticmethod
+    def attrib_list(*attribs: int) -> ctypes.Array:
+        return (EGL.EGLint * (len(attribs) + 1))(*attribs, EGL.EGL_NONE)
+
+    @property
+    def renderer(self) -> str:
+        return GL.glGetString(GL.GL_RENDERER).decode()
+
+    def read_image(self) -> Image.Image:
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, self.framebuffer)
+        data = GL.glReadPixels(
+            0, 0, self.width, self.height, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE
+        )
+        pixels = np.frombuffer(data, np.uint8)
+        pixels = pixels.reshape(self.height, self.width, 4)
+        return Image.fromarray(pixels[::-1])
+
+    def close(self) -> None:
+        GL.glDeleteFramebuffers(1, [self.framebuffer])
+        GL.glDeleteRenderbuffers(1, [self._renderbuffer])
+        EGL.eglMakeCurrent(
+            self._display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE,
+            EGL.EGL_NO_CONTEXT
+        )
+        EGL.eglDestroyContext(self._display, self._context)
+        EGL.eglTerminate(self._display)
+
+
+class FrameSource:
+    """Synthetic pad frames with moving sensor bars and animated LEDs."""
+
+    NOISE = 3
+    MAX_DELTA = 120
+
+    def __init__(self, model: PadModel, seed: int = 0):
+        self._entry = model.get_model_data()
+        self._generator = np.random.default_rng(seed)
+        self._engine = LightingEngine(model)
+        self._engine.subscribe(
+            LEDDataGenerator(model.get_led_array().shape)
+        )
+        shape = self._entry.current.shape
+        self._entry.base[:] = 500
+        self._entry.threshold[:] = self._generator.integers(20, 90, shape)
+        self._entry.hysteresis[:] = 5
+        self._delta = self._generator.integers(0, self.MAX_DELTA, shape)
+        self._pressed = np.zeros(shape[0], np.bool_)
+        self._now = time.monotonic_ns()
+
+    @property
+    def entry(self) -> PadEntry:
+        return self._entry
+
+    def advance(self, frame_secs: float) -> None:
+        self._now += int(frame_secs * 1e9)
+        step = self._generator.integers(
+            -self.NOISE, self.NOISE + 1, self._delta.shape
+        )
+        np.clip(self._delta + step, 0, self.MAX_DELTA, out=self._delta)
+        entry = self._entry
+        entry.current[:] = entry.base + self._delta
+        entry.active[:] = self._delta >= entry.threshold
+        pressed = entry.active.any(axis=1)
+        panels = np.flatnonzero(pressed != self._pressed)
+        self._pressed = pressed
+        edges = (np.zeros_like(panels), panels, pressed[panels])
+        stamps = np.array([self._now], np.uint64)
+        self._engine.handle_edges(edges, stamps)
+        self._engine.render(self._now)
+
+
+def render_frames(
+    context: HeadlessContext, source: FrameSource, frames: int,
+    png_dir: pathlib.Path | None, png_every: int
+) -> tuple[float, float]:
+    view = PadWidgetView()
+    view.init_painting(source.entry)
+    view.handle_resize_event(context.width, context.height)
+    view.update_sensor_thresholds()
+    wall = cpu = 0.0
+    for frame in range(frames):
+        source.advance(1.0 / 60.0)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        view.draw_widget(context.framebuffer)
+        GL.glFinish()
+        wall += time.perf_counter() - wall_start
+        cpu += time.process_time() - cpu_start
+        if png_dir is not None and (
+            frame == 0 or png_every and frame % png_every == 0
+        ):
+            context.read_image().save(png_dir / f"frame_{frame:05d}.png")
+    return wall, cpu
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Render the pad view offscreen and time each frame."
+    )
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--size", type=int, default=PadWidgetView.SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--png", type=pathlib.Path, metavar="DIR")
+    parser.add_argument("--png-every", type=int, default=0, metavar="N")
+    parser.add_argument(
+        "--compat", action="store_true",
+        help="use a compatibility context instead of 3.3 core"
+    )
+    args = parser.parse_args()
+    if args.frames < 1:
+        parser.error("--frames must be at least 1")
+    if args.png is not None:
+        args.png.mkdir(parents=True, exist_ok=True)
+
+    context = HeadlessContext(args.size, args.size, core=not args.compat)
+    try:
+        source = FrameSource(PadModel(), args.seed)
+        wall, cpu = render_frames(
+            context, source, args.frames, args.png, args.png_every
+        )
+        print(f"renderer:          {context.renderer}")
+    finally:
+        context.close()
+    print(f"frames:            {args.frames:12d}")
+    print(f"frames/s:          {args.frames / wall:12.1f}")
+    print(f"wall ms/frame:     {wall / args.frames * 1e3:12.3f}")
+    print(f"cpu ms/frame:      {cpu / args.frames * 1e3:12.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,14 @@ class ConnectionWidget(QtWidgets.QWidget):
     REFRESH_ICON = QtWidgets.QStyle.StandardPixmap.SP_BrowserReload
     CONNECT_PAD_ICON = QtWidgets.QStyle.StandardPixmap.SP_MediaPlay
     DISCONNECT_PAD_ICON = QtWidgets.QStyle.StandardPixmap.SP_MediaStop
+    LATENCY_ICON = QtWidgets.QStyle.StandardPixmap.SP_FileDialogInfoView
 
     LABEL_STR = "Pad:"
+    LATENCY_TITLE = "Input latency"
+    LATENCY_DUMP_STR = "Save latency histograms"
+    LATENCY_DUMP_FILE = "latency.json"
+    LATENCY_DUMP_FILTER = "JSON (*.json)"
+    KEY_ERROR_TITLE = "Key output"
 
     DROP_H_POLICY = QtWidgets.QSizePolicy.Policy.Expanding
     DROP_V_POLICY = QtWidgets.QSizePolicy.Policy.Preferred
@@ -19,6 +25,8 @@ class ConnectionWidget(QtWidgets.QWidget):
 
     REFRESH_CLICKED = QtCore.Signal()
     CONNECT_CLICKED = QtCore.Signal()
+    DROPDOWN_ACTIVATED = QtCore.Signal(str)
+    LATENCY_CLICKED = QtCore.Signal()
 
     def __init__(self):
         super(ConnectionWidget, self).__init__()
@@ -27,6 +35,8 @@ class ConnectionWidget(QtWidgets.QWidget):
         self._set_toolbutton_icon(self._refresh, self.REFRESH_ICON)
         self._connect = QtWidgets.QToolButton()
         self._set_toolbutton_icon(self._connect, self.CONNECT_PAD_ICON)
+        self._latency = QtWidgets.QToolButton()
+        self._set_toolbutton_icon(self._latency, self.LATENCY_ICON)
         self._label = QtWidgets.QLabel(self.LABEL_STR)
         self._label.setContentsMargins(*self.LABEL_PADDING)
         self._dropdown = QtWidgets.QComboBox()
@@ -37,11 +47,14 @@ class ConnectionWidget(QtWidgets.QWidget):
         layout.addWidget(self._dropdown)
         layout.addWidget(self._connect)
         layout.addWidget(self._refresh)
+        layout.addWidget(self._latency)
         layout.setContentsMargins(*self.LAYOUT_PADDING)
         self.setLayout(layout)
 
         self._refresh.clicked.connect(self.REFRESH_CLICKED.emit)
         self._connect.clicked.connect(self.CONNECT_CLICKED.emit)
+        self._dropdown.activated.connect(self.DROPDOWN_ACTIVATED.emit)
+        self._latency.clicked.connect(self.LATENCY_CLICKED.emit)
 
     def _set_toolbutton_icon(
         self, button: QtWidgets.QToolButton,
@@ -79,3 +92,19 @@ class ConnectionWidget(QtWidgets.QWidget):
 
     def get_pad_serial(self,) -> str:
         return self._dropdown.currentText()
+
+    def get_latency_path(self) -> str:
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, self.LATENCY_DUMP_STR, self.LATENCY_DUMP_FILE,
+            self.LATENCY_DUMP_FILTER
+        )
+        return path
+
+    def show_latency_report(self, report: str) -> None:
+        message = QtWidgets.QMessageBox(self)
+        message.setWindowTitle(self.LATENCY_TITLE)
+        message.setText(f"<pre>{report}</pre>")
+        message.exec_()
+
+    def show_key_error(self, message: str) -> None:
+        QtWidgets.QMessageBox.warning(self, self.KEY_ERROR_TITLE, message)
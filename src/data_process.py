@@ -1,37 +1,103 @@
+import asyncio
+import contextlib
 import multiprocessing
+import threading
+import time
 
 from data_sequences import Sequences
+from event_info import DataProcessMessage, WidgetMessage
+from pad_snapshot import PadSnapshot
 
 
 class DataProcess(multiprocessing.Process):
     """Main process for data handling."""
 
+    BATCH_BUDGET_SECS = 0.002
+
     def __init__(self):
         super(DataProcess, self).__init__()
         self._rx_queue = multiprocessing.Queue()
         self._tx_queue = multiprocessing.Queue()
+        self._snapshot = PadSnapshot()
 
     def send_event(self, message: str, data: ... = None):
         self._tx_queue.put_nowait((message, data))
 
     def run(self) -> None:
         self._sequences = Sequences()
+        self._sequences.pad_controller.snapshot = self._snapshot
+        self._sequences.profile_controller.on_saved = self.profile_saved
+        asyncio.run(self.run_loop())
+
+    async def run_loop(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._messages = asyncio.Queue()
+        self._pad_ready = asyncio.Event()
+        threading.Thread(target=self.receive_messages, daemon=True).start()
+        threading.Thread(target=self.receive_pad_ready, daemon=True).start()
+        self._tasks = asyncio.gather(
+            self.handle_pads(), self.handle_messages()
+        )
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._tasks
+
+    def profile_saved(self, success: bool) -> None:
+        self.send_event(DataProcessMessage.PROFILE_SAVED, success)
+
+    def receive_messages(self) -> None:
         while True:
+            message = self._rx_queue.get()
+            self._loop.call_soon_threadsafe(self._messages.put_nowait, message)
+
+    def receive_pad_ready(self) -> None:
+        notify = self._sequences.pad_controller.notify
+        while True:
+            notify.wait()
+            notify.clear()
+            self._loop.call_soon_threadsafe(self._pad_ready.set)
+
+    async def handle_pads(self) -> None:
+        while True:
+            await self._pad_ready.wait()
+            self._pad_ready.clear()
             self._sequences.handle_pad_data()
-            if not self._rx_queue.empty():
-                self.handle_events()
+            self.publish_frame()
+
+    def publish_frame(self) -> None:
+        if (updated := self._sequences.publish_frame()) is not None:
+            self.send_event(DataProcessMessage.FRAME_DATA, updated)
+
+    async def handle_messages(self) -> None:
+        while True:
+            await self.handle_events(await self._messages.get())
+            deadline = time.perf_counter() + self.BATCH_BUDGET_SECS
+            while (
+                not self._messages.empty() and
+                time.perf_counter() < deadline
+            ):
+                await self.handle_events(self._messages.get_nowait())
+            self._sequences.push_settings()
+            self.publish_frame()
+            await asyncio.sleep(0)
 
-    def handle_events(self):
-        rx_mes, rx_data = self._rx_queue.get_nowait()
+    async def handle_events(self, message: tuple[str, list]) -> None:
+        rx_mes, rx_data = message
         requested_methods = self._sequences.receive.get(rx_mes, [])
         for request in requested_methods:
-            tx_data = request(*rx_data)
+            if asyncio.iscoroutinefunction(request):
+                tx_data = await request(*rx_data)
+            elif request in self._sequences.blocking:
+                tx_data = await asyncio.to_thread(request, *rx_data)
+            else:
+                tx_data = request(*rx_data)
             if tx_data is None:
                 continue
             tx_mes = self._sequences.transmit.get(request, None)
             if tx_mes is None:
                 continue
             self.send_event(tx_mes, tx_data)
+        if rx_mes == WidgetMessage.QUIT:
+            self._tasks.cancel()
 
     @property
     def rx_queue(self) -> multiprocessing.Queue:
@@ -40,3 +106,7 @@ class DataProcess(multiprocessing.Process):
     @property
     def tx_queue(self) -> multiprocessing.Queue:
         return self._tx_queue
+
+    @property
+    def snapshot(self) -> PadSnapshot:
+        return self._snapshot
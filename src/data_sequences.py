@@ -1,75 +1,120 @@
 from event_info import DataProcessMessage, WidgetMessage
-from pad_model import PadModel
 from profile_controller import ProfileController
 from reflex_controller import ReflexController
 
 
 class Sequences:
-    pad_model = PadModel()
-    pad_controller = ReflexController(pad_model)
-    profile_controller = ProfileController(pad_model)
+    pad_controller = ReflexController()
+    profile_controller = ProfileController(pad_controller)
     _sensor_delta = None
     _light_delta = None
 
     receive = {
         WidgetMessage.CONNECT: [
-            pad_controller.toggle_pad_connection
+            pad_controller.toggle_pad_connection,
+            profile_controller.get_pad_profile,
+            profile_controller.get_filter_config,
+            pad_controller.get_key_error
         ],
         WidgetMessage.FRAME_READY: [
-            pad_model.get_model_data
+            pad_controller.publish_model_data
         ],
         WidgetMessage.INIT: [
             pad_controller.get_all_pads,
             profile_controller.initialise_profile,
-            pad_model.get_model_data
+            profile_controller.get_filter_config,
+            pad_controller.publish_model_data
         ],
         WidgetMessage.KEYS: [
             profile_controller.handle_keys
         ],
+        WidgetMessage.LATENCY: [
+            pad_controller.report_latency
+        ],
+        WidgetMessage.IMPORT: [
+            profile_controller.import_profiles,
+            profile_controller.get_filter_config
+        ],
+        WidgetMessage.EXPORT: [
+            profile_controller.export_profiles
+        ],
+        WidgetMessage.FILTER: [
+            profile_controller.handle_filter,
+            profile_controller.get_filter_config
+        ],
         WidgetMessage.NEW: [
-            pad_model.set_default,
-            profile_controller.create_new_profile
+            pad_controller.set_default,
+            profile_controller.create_new_profile,
+            profile_controller.get_filter_config
         ],
         WidgetMessage.QUIT: [
-            pad_controller.disconnect_pad
+            pad_controller.disconnect_pad,
+            profile_controller.flush_profiles
         ],
         WidgetMessage.REFRESH: [
             pad_controller.enumerate_pads,
             pad_controller.get_all_pads
         ],
         WidgetMessage.SENSOR_UPDATE: [
-            pad_model.set_sensor
+            pad_controller.set_sensor
         ],
         WidgetMessage.SAVE: [
             profile_controller.save_user_profile
         ],
         WidgetMessage.SELECT: [
-            profile_controller.load_user_profile
+            profile_controller.load_user_profile,
+            profile_controller.get_filter_config
+        ],
+        WidgetMessage.SELECT_PAD: [
+            pad_controller.select_pad,
+            profile_controller.get_pad_profile,
+            profile_controller.get_filter_config
         ],
         WidgetMessage.REMOVE: [
-            profile_controller.remove_user_profile
+            profile_controller.remove_user_profile,
+            profile_controller.get_filter_config
         ],
         WidgetMessage.RENAME: [
             profile_controller.rename_user_profile
         ],
         WidgetMessage.VIEW_UPDATED: [
-            pad_model.view_updated
+            pad_controller.view_updated
         ]
     }
 
+    blocking = {
+        pad_controller.report_latency,
+        profile_controller.export_profiles,
+        profile_controller.flush_profiles
+    }
+
     transmit = {
         pad_controller.get_all_pads:
             DataProcessMessage.ALL_PADS,
         pad_controller.toggle_pad_connection:
             DataProcessMessage.PAD_CONNECTED,
-        pad_model.get_model_data:
+        pad_controller.select_pad:
+            DataProcessMessage.PAD_CONNECTED,
+        pad_controller.publish_model_data:
             DataProcessMessage.FRAME_DATA,
-        pad_model.set_sensor:
+        pad_controller.set_sensor:
             DataProcessMessage.SENSOR_UPDATED,
+        pad_controller.report_latency:
+            DataProcessMessage.LATENCY_REPORT,
+        profile_controller.import_profiles:
+            DataProcessMessage.PROFILES_IMPORTED,
+        profile_controller.export_profiles:
+            DataProcessMessage.PROFILES_EXPORTED,
+        profile_controller.get_filter_config:
+            DataProcessMessage.FILTER_CONFIG,
+        pad_controller.get_key_error:
+            DataProcessMessage.KEY_ERROR,
         profile_controller.create_new_profile:
             DataProcessMessage.PROFILE_NEW,
         profile_controller.load_user_profile:
             DataProcessMessage.PROFILE_LOADED,
+        profile_controller.get_pad_profile:
+            DataProcessMessage.PROFILE_LOADED,
         profile_controller.initialise_profile:
             DataProcessMessage.PROFILE_NAMES,
         profile_controller.remove_user_profile:
@@ -81,12 +126,10 @@ class Sequences:
     }
 
     def handle_pad_data(self) -> bool:
-        if not (pad := self.pad_controller.pad):
-            return False
-        pad.handle_sensor_data()
-        if pad._sensors.refreshed:
-            self.pad_model.set_baseline(pad.pad_data)
-        else:
-            self.pad_model.set_sensor_data(pad.pad_data)
-        pad.handle_light_data()
-        return True
+        return self.pad_controller.handle_pad_data()
+
+    def push_settings(self) -> None:
+        self.pad_controller.push_settings()
+
+    def publish_frame(self) -> bool | None:
+        return self.pad_controller.publish_requested_frame()
@@ -3,6 +3,7 @@ class WidgetMessage:
 
     REFRESH = "GUI_refresh_pads"
     CONNECT = "GUI_connect_pad"
+    SELECT_PAD = "GUI_select_pad"
     NEW = "GUI_new_profile"
     REMOVE = "GUI_remove_profile"
     RENAME = "GUI_rename_profile"
@@ -14,6 +15,10 @@ class WidgetMessage:
     SENSOR_UPDATE = "GUI_sensor_update"
     VIEW_UPDATED = "GUI_view_updated"
     KEYS = "GUI_keys"
+    LATENCY = "GUI_latency"
+    IMPORT = "GUI_import_profiles"
+    EXPORT = "GUI_export_profiles"
+    FILTER = "GUI_filter"
 
 
 class DataProcessMessage:
@@ -29,3 +34,8 @@ class DataProcessMessage:
     PROFILE_RENAMED = "DP_profile_renamed"
     PROFILE_REMOVED = "DP_profile_removed"
     SENSOR_UPDATED = "DP_sensor_updated"
+    LATENCY_REPORT = "DP_latency_report"
+    PROFILES_IMPORTED = "DP_profiles_imported"
+    PROFILES_EXPORTED = "DP_profiles_exported"
+    FILTER_CONFIG = "DP_filter_config"
+    KEY_ERROR = "DP_key_error"
@@ -1,5 +1,4 @@
 from connection_widget import ConnectionWidget
-from pad_model import PadEntry
 from pad_widget import PadWidget
 from profile_widget import ProfileWidget
 
@@ -24,7 +23,9 @@ class GUIHandlers:
         self._profile_widget.set_new_button(False)
         self._profile_widget.set_remove_button(False)
         self._profile_widget.set_rename_button(False)
+        self._profile_widget.set_library_buttons(False)
         self._profile_widget.set_dropdown_state(False)
+        self._profile_widget.set_filter_state(False)
 
     def all_pads_received(self, all_pads: list[str]) -> None:
         pads_available = len(all_pads) > 0
@@ -39,19 +40,19 @@ class GUIHandlers:
         self._profile_set_widget_states()
 
     def pad_connected(self, connected: bool) -> None:
-        self._connection_widget.set_dropdown_state(not connected)
         self._connection_widget.set_connect_button_icon(not connected)
-        self._connection_widget.set_refresh_button_state(not connected)
+        self._pad_widget.update_sensor_thresholds()
 
-    def frame_data_received(self, frame_data: PadEntry) -> None:
-        if frame_data.updated:
+    def frame_data_received(self, updated: bool) -> None:
+        if updated:
             self._profile_widget.set_save_button(True)
-        self._pad_widget.update(frame_data)
+        self._pad_widget.update()
 
     def profile_saved(self, success: bool) -> None:
         self._profile_widget.set_save_button(not success)
 
     def profile_loaded(self, name: str) -> None:
+        self._profile_widget.set_dropdown_by_text(name)
         self._profile_widget.set_save_button(False)
 
     def profile_renamed(self, names: tuple[str, str]) -> None:
@@ -79,7 +80,31 @@ class GUIHandlers:
         self._profile_widget.set_remove_button(profiles_available)
         self._profile_widget.set_new_button(True)
         self._profile_widget.set_rename_button(True)
+        self._profile_widget.set_library_buttons(True)
+        self._profile_widget.set_filter_state(True)
         self._profile_widget.set_save_button(False)
 
     def sensor_updated(self) -> None:
+        self._pad_widget.sensor_acknowledged()
         self._pad_widget.update_sensor_thresholds()
+
+    def latency_report_received(self, report: str) -> None:
+        self._connection_widget.show_latency_report(report)
+
+    def key_error_received(self, error: str) -> None:
+        self._connection_widget.show_key_error(error)
+
+    def profiles_imported(self, result: tuple[list[str], str, str]) -> None:
+        names, current, error = result
+        self._profile_widget.set_dropdown_items(names)
+        self._profile_widget.set_dropdown_by_text(current)
+        self._profile_set_widget_states()
+        if error:
+            self._profile_widget.show_transfer_error(error)
+
+    def profiles_exported(self, error: str) -> None:
+        if error:
+            self._profile_widget.show_transfer_error(error)
+
+    def filter_config_received(self, config: dict) -> None:
+        self._profile_widget.set_filter_config(config)
@@ -4,7 +4,6 @@ import PySide6.QtWidgets as QtWidgets
 from connection_widget import ConnectionWidget
 from event_info import WidgetMessage, DataProcessMessage
 from gui_handlers import GUIHandlers
-from pad_model import PadEntry
 from pad_widget import PadWidget
 from profile_widget import ProfileWidget
 
@@ -13,7 +12,7 @@ class DataReceiveSignaller(QtWidgets.QWidget):
     """Signal to emit when GUI event loop receives data from Data process."""
 
     ALL_PADS = QtCore.Signal(list)
-    FRAME_DATA = QtCore.Signal(PadEntry)
+    FRAME_DATA = QtCore.Signal(bool)
     PAD_CONNECTED = QtCore.Signal(bool)
     PROFILE_LOADED = QtCore.Signal(str)
     PROFILE_NAMES = QtCore.Signal(list)
@@ -23,6 +22,11 @@ class DataReceiveSignaller(QtWidgets.QWidget):
     PROFILE_SAVED = QtCore.Signal(bool)
     SENSOR_UPDATED = QtCore.Signal(bool)
     KEYS_UPDATED = QtCore.Signal()
+    LATENCY_REPORT = QtCore.Signal(str)
+    PROFILES_IMPORTED = QtCore.Signal(tuple)
+    PROFILES_EXPORTED = QtCore.Signal(str)
+    FILTER_CONFIG = QtCore.Signal(dict)
+    KEY_ERROR = QtCore.Signal(str)
 
     def __init__(self):
         super(DataReceiveSignaller, self).__init__()
@@ -40,7 +44,10 @@ class Widgets:
 
         self.hooks = {
             self.connection_widget.CONNECT_CLICKED: WidgetMessage.CONNECT,
+            self.connection_widget.DROPDOWN_ACTIVATED:
+                WidgetMessage.SELECT_PAD,
             self.connection_widget.REFRESH_CLICKED: WidgetMessage.REFRESH,
+            self.connection_widget.LATENCY_CLICKED: WidgetMessage.LATENCY,
             self.pad_widget.FRAME_READY: WidgetMessage.FRAME_READY,
             self.pad_widget.NEW_SENS_VALUE: WidgetMessage.SENSOR_UPDATE,
             self.pad_widget.VIEW_UPDATED: WidgetMessage.VIEW_UPDATED,
@@ -49,13 +56,17 @@ class Widgets:
             self.profile_widget.REMOVE_CLICKED: WidgetMessage.REMOVE,
             self.profile_widget.RENAME_CLICKED: WidgetMessage.RENAME,
             self.profile_widget.SAVE_CLICKED: WidgetMessage.SAVE,
-            self.profile_widget.KEYS_CLICKED: WidgetMessage.KEYS
+            self.profile_widget.KEYS_CLICKED: WidgetMessage.KEYS,
+            self.profile_widget.IMPORT_CLICKED: WidgetMessage.IMPORT,
+            self.profile_widget.EXPORT_CLICKED: WidgetMessage.EXPORT,
+            self.profile_widget.FILTER_CHANGED: WidgetMessage.FILTER
         }
 
         self.data_requests = {
             WidgetMessage.CONNECT: [self.connection_widget.get_pad_serial],
             WidgetMessage.FRAME_READY: [],
             WidgetMessage.INIT: [],
+            WidgetMessage.LATENCY: [self.connection_widget.get_latency_path],
             WidgetMessage.NEW: [],
             WidgetMessage.QUIT: [],
             WidgetMessage.REFRESH: [],
@@ -66,9 +77,15 @@ class Widgets:
             ],
             WidgetMessage.SAVE: [self.profile_widget.get_pad_name],
             WidgetMessage.SELECT: [self.profile_widget.get_pad_name],
+            WidgetMessage.SELECT_PAD: [
+                self.connection_widget.get_pad_serial
+            ],
             WidgetMessage.SENSOR_UPDATE: [self.pad_widget.get_update_data],
             WidgetMessage.VIEW_UPDATED: [],
-            WidgetMessage.KEYS: [self.profile_widget.get_keys]
+            WidgetMessage.KEYS: [self.profile_widget.get_keys],
+            WidgetMessage.IMPORT: [self.profile_widget.get_import_path],
+            WidgetMessage.EXPORT: [self.profile_widget.get_export_path],
+            WidgetMessage.FILTER: [self.profile_widget.get_filter_config]
         }
 
         self.process_requests = {
@@ -81,7 +98,14 @@ class Widgets:
             DataProcessMessage.PROFILE_REMOVED: self.signals.PROFILE_REMOVED,
             DataProcessMessage.PROFILE_RENAMED: self.signals.PROFILE_RENAMED,
             DataProcessMessage.PROFILE_SAVED: self.signals.PROFILE_SAVED,
-            DataProcessMessage.SENSOR_UPDATED: self.signals.SENSOR_UPDATED
+            DataProcessMessage.SENSOR_UPDATED: self.signals.SENSOR_UPDATED,
+            DataProcessMessage.LATENCY_REPORT: self.signals.LATENCY_REPORT,
+            DataProcessMessage.PROFILES_IMPORTED:
+                self.signals.PROFILES_IMPORTED,
+            DataProcessMessage.PROFILES_EXPORTED:
+                self.signals.PROFILES_EXPORTED,
+            DataProcessMessage.FILTER_CONFIG: self.signals.FILTER_CONFIG,
+            DataProcessMessage.KEY_ERROR: self.signals.KEY_ERROR
         }
 
         self.signal_handlers = {
@@ -94,5 +118,10 @@ class Widgets:
             self.signals.PROFILE_REMOVED: self.handlers.profile_removed,
             self.signals.PROFILE_RENAMED: self.handlers.profile_renamed,
             self.signals.PROFILE_SAVED: self.handlers.profile_saved,
-            self.signals.SENSOR_UPDATED: self.handlers.sensor_updated
+            self.signals.SENSOR_UPDATED: self.handlers.sensor_updated,
+            self.signals.LATENCY_REPORT: self.handlers.latency_report_received,
+            self.signals.PROFILES_IMPORTED: self.handlers.profiles_imported,
+            self.signals.PROFILES_EXPORTED: self.handlers.profiles_exported,
+            self.signals.FILTER_CONFIG: self.handlers.filter_config_received,
+            self.signals.KEY_ERROR: self.handlers.key_error_received
         }
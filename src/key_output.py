@@ -0,0 +1,198 @@
+import abc
+import collections
+import os
+import struct
+import threading
+import time
+
+import keyboard
+
+from profiler import LatencyRecorder
+
+
+class KeyOutputBackend(abc.ABC):
+    """Base class for sinks of panel key press and release events."""
+
+    NAME = "none"
+
+    @abc.abstractmethod
+    def press(self, key: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def release(self, key: str) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class KeyboardBackend(KeyOutputBackend):
+    """Emits key events through the keyboard module."""
+
+    NAME = "keyboard"
+
+    def press(self, key: str) -> None:
+        keyboard.press(key)
+
+    def release(self, key: str) -> None:
+        keyboard.release(key)
+
+
+class UInputBackend(KeyOutputBackend):
+    """Emits key events from a Linux uinput virtual keyboard and gamepad."""
+
+    NAME = "uinput"
+    DEVICE_PATH = "/dev/uinput"
+    DEVICE_NAME = b"RE:Flex virtual pad"
+    BUS_VIRTUAL = 0x06
+
+    EV_SYN = 0x00
+    EV_KEY = 0x01
+    SYN_REPORT = 0x00
+    UI_SET_EVBIT = 0x40045564
+    UI_SET_KEYBIT = 0x40045565
+    UI_DEV_CREATE = 0x5501
+    UI_DEV_DESTROY = 0x5502
+
+    EVENT_FORMAT = "llHHi"
+    DEVICE_FORMAT = "80sHHHHI256i"
+
+    KEY_CODES = {
+        **dict(zip("1234567890", range(2, 12))),
+        **dict(zip("qwertyuiop", range(16, 26))),
+        **dict(zip("asdfghjkl", range(30, 39))),
+        **dict(zip("zxcvbnm", range(44, 51))),
+        "enter": 28,
+        "space": 57,
+        "up": 103,
+        "left": 105,
+        "right": 106,
+        "down": 108,
+        "btn_south": 0x130,
+        "btn_east": 0x131,
+        "btn_north": 0x133,
+        "btn_west": 0x134,
+        "dpad_up": 0x220,
+        "dpad_down": 0x221,
+        "dpad_left": 0x222,
+        "dpad_right": 0x223
+    }
+
+    def __init__(self):
+        import fcntl
+
+        self._fcntl = fcntl
+        self._fd = os.open(self.DEVICE_PATH, os.O_WRONLY | os.O_NONBLOCK)
+        fcntl.ioctl(self._fd, self.UI_SET_EVBIT, self.EV_KEY)
+        for code in self.KEY_CODES.values():
+            fcntl.ioctl(self._fd, self.UI_SET_KEYBIT, code)
+        device = struct.pack(
+            self.DEVICE_FORMAT, self.DEVICE_NAME, self.BUS_VIRTUAL,
+            0, 0, 1, 0, *([0] * 256)
+        )
+        os.write(self._fd, device)
+        fcntl.ioctl(self._fd, self.UI_DEV_CREATE)
+
+    def _emit(self, key: str, value: int) -> None:
+        if (code := self.KEY_CODES.get(key.lower())) is None:
+            return
+        os.write(
+            self._fd,
+            struct.pack(self.EVENT_FORMAT, 0, 0, self.EV_KEY, code, value) +
+            struct.pack(
+                self.EVENT_FORMAT, 0, 0, self.EV_SYN, self.SYN_REPORT, 0
+            )
+        )
+
+    def press(self, key: str) -> None:
+        self._emit(key, 1)
+
+    def release(self, key: str) -> None:
+        self._emit(key, 0)
+
+    def close(self) -> None:
+        self._fcntl.ioctl(self._fd, self.UI_DEV_DESTROY)
+        os.close(self._fd)
+
+
+class NullBackend(KeyOutputBackend):
+    """Drops key events when no key output device can be opened."""
+
+    def press(self, key: str) -> None:
+        pass
+
+    def release(self, key: str) -> None:
+        pass
+
+
+class RecordingBackend(KeyOutputBackend):
+    """Keeps key events in memory for tests and benchmarks."""
+
+    NAME = "recording"
+
+    def __init__(self):
+        self.events: list[tuple[str, bool, int]] = []
+
+    def press(self, key: str) -> None:
+        self.events.append((key, True, time.monotonic_ns()))
+
+    def release(self, key: str) -> None:
+        self.events.append((key, False, time.monotonic_ns()))
+
+
+class KeyOutput:
+    """Emits queued panel key events from a dedicated thread."""
+
+    BACKEND_ENV = "REFLEX_KEY_BACKEND"
+    BACKENDS = {
+        "keyboard": KeyboardBackend,
+        "uinput": UInputBackend,
+        "recording": RecordingBackend
+    }
+
+    @classmethod
+    def default_backend(cls) -> KeyOutputBackend:
+        return cls.BACKENDS[os.environ.get(cls.BACKEND_ENV, "keyboard")]()
+
+    def __init__(
+        self, backend: KeyOutputBackend, latency: LatencyRecorder | None = None
+    ):
+        self._backend = backend
+        self._latency = latency
+        self._events = collections.deque()
+        self._ready = threading.Event()
+        self._running = True
+        if latency is not None:
+            latency.backend = backend.NAME
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def emit(self, key: str, pressed: bool, read: int, queued: int) -> None:
+        self._events.append((key, pressed, read, queued))
+        self._ready.set()
+
+    def _run(self) -> None:
+        while self._running:
+            self._ready.wait()
+            self._ready.clear()
+            while self._events:
+                key, pressed, read, queued = self._events.popleft()
+                if pressed:
+                    self._backend.press(key)
+                else:
+                    self._backend.release(key)
+                if self._latency is not None:
+                    emitted = time.monotonic_ns()
+                    self._latency.record("key_emit", emitted - queued)
+                    self._latency.record("total", emitted - read)
+
+    def close(self) -> None:
+        self._running = False
+        self._ready.set()
+        self._thread.join()
+        self._backend.close()
+
+    @property
+    def backend(self) -> KeyOutputBackend:
+        return self._backend
@@ -1,12 +1,16 @@
 import time
 
-from pad_model import PadModel, Coord, Colour
+import numpy as np
 
+from lighting_engine import LightingEffect
+from pad_model import PadModel, Coord
 
-class LEDDataGenerator:
-    """Dummy data to test pad widget animations."""
+
+class LEDDataGenerator(LightingEffect):
+    """Rainbow arrows that light up while their panel is pressed."""
 
     BASE_MAX = 0.35
+    PHASE_RATE = 0.625
 
     @staticmethod
     def panel_bases() -> dict[Coord, list[Coord]]:
@@ -51,99 +55,94 @@ class LEDDataGenerator:
 
     PANEL_BASES = panel_bases()
 
-    def __init__(
-        self, model: PadModel
-    ):
-        self._t = 0
-        self._model = model
+    @staticmethod
+    def panel_phases(
+        led_shape: tuple[int, ...]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        x = np.arange(led_shape[1]).reshape(-1, 1)
+        y = np.arange(led_shape[2]).reshape(1, -1)
+        far_x = led_shape[1] - 1 - x
+        far_y = led_shape[2] - 1 - y
+        phases_x = np.zeros(led_shape[:3])
+        phases_y = np.zeros(led_shape[:3])
+        for index, coord in enumerate(PadModel.PANELS.coords):
+            if coord == PadModel.PANELS.coords[1]:
+                phases_x[index] = x * 0.02
+                phases_y[index] = y * 0.1
+            elif coord == PadModel.PANELS.coords[3]:
+                phases_x[index] = x * 0.1
+                phases_y[index] = y * 0.02
+            elif coord == PadModel.PANELS.coords[2]:
+                phases_x[index] = far_x * 0.02
+                phases_y[index] = far_y * 0.1
+            else:
+                phases_x[index] = far_x * 0.1
+                phases_y[index] = far_y * 0.02
+        return phases_x, phases_y
+
+    @classmethod
+    def panel_masks(cls, led_shape: tuple[int, ...]) -> np.ndarray:
+        masks = np.zeros(led_shape[:3], np.bool_)
+        for index, coord in enumerate(PadModel.PANELS.coords):
+            for x, y in cls.PANEL_BASES[coord]:
+                masks[index, x, y] = True
+        return masks
+
+    def __init__(self, led_shape: tuple[int, ...]):
+        self._origin = time.monotonic_ns()
         self._att = 0.01
         self._dec = 0.16
-        self._tim = {}
-
-    def update_led_frame(self) -> None:
-        self._t += 1
-        self._current_data = self._model.get_model_data()
-        for panel_coord, panel in self._current_data.panels.items():
-            current_active = True
-            active_leds = self.PANEL_BASES[panel_coord]
-            panel_value = self.get_panel_value(panel_coord, current_active)
-            for led_coord, led in panel.leds.items():
-                if led_coord in active_leds:
-                    led.colour = self.get_led_colour(
-                        panel_coord, led_coord, panel_value
-                    )
-
-    def get_led_colour(self, panel: Coord, led: Coord, value: float) -> Colour:
-        phase_multiplier = 0.01
-        phase_offset = self._t * phase_multiplier
-        dir_phase_x = 0
-        dir_phase_y = 0
-        x = led[0]
-        y = led[1]
-        if panel == PadModel.PANELS.coords[1]:
-            dir_phase_x = x * 0.02
-            dir_phase_y = y * 0.1
-        elif panel == PadModel.PANELS.coords[3]:
-            dir_phase_x = x * 0.1
-            dir_phase_y = y * 0.02
-        elif panel == PadModel.PANELS.coords[2]:
-            dir_phase_x = (11 - x) * 0.02
-            dir_phase_y = (11 - y) * 0.1
-        else:
-            dir_phase_x = (11 - x) * 0.1
-            dir_phase_y = (11 - y) * 0.02
-        hue = int((phase_offset + dir_phase_x + dir_phase_y) * 255) % 255
-        sat = 255
-        val = int(255 * value)
-        r, g, b = self.hsv_to_rgb(hue, sat, val)
-        return (r, g, b)
-
-    def get_panel_value(self, panel: Coord, active: int) -> float:
-        current_time = time.time()
-        if active:
-            if panel not in self._tim or not self._tim[panel]['active']:
-                self._tim[panel] = {'start': current_time, 'active': True}
-            elapsed = current_time - self._tim[panel]['start']
-            if elapsed < self._att:
-                return self.BASE_MAX * (elapsed / self._att)
-            return self.BASE_MAX
-        else:
-            if panel not in self._tim:
-                return 0.0
-            if self._tim[panel].get('end', None) is None:
-                self._tim[panel]['end'] = current_time
-                self._tim[panel]['active'] = False
-            elapsed = current_time - self._tim[panel]['end']
-            if elapsed < self._dec:
-                return self.BASE_MAX - self.BASE_MAX * (elapsed / self._dec)
-            return 0.0
+        num_panels = len(PadModel.PANELS.coords)
+        self._active = np.zeros(num_panels, np.bool_)
+        self._start = np.zeros(num_panels, np.int64)
+        self._end = np.full(num_panels, np.iinfo(np.int64).min // 2)
+        self._phases_x, self._phases_y = self.panel_phases(led_shape)
+        self._masks = self.panel_masks(led_shape)
+
+    def on_press(self, panel: int, stamp: int) -> None:
+        if not self._active[panel]:
+            self._active[panel] = True
+            self._start[panel] = stamp
+
+    def on_release(self, panel: int, stamp: int) -> None:
+        if self._active[panel]:
+            self._active[panel] = False
+            self._end[panel] = stamp
+
+    def animating(self, now: int) -> bool:
+        decaying = now - self._end < self._dec * 1e9
+        return bool(self._active.any() or decaying.any())
+
+    def render(self, now: int, leds: np.ndarray) -> None:
+        values = (255 * self.get_panel_values(now)).astype(np.int32)
+        phase_offset = (now - self._origin) / 1e9 * self.PHASE_RATE
+        phase = phase_offset + self._phases_x + self._phases_y
+        hue = (phase * 255).astype(np.int32) % 255
+        rgb = self.hsv_to_rgb(hue, 255, values.reshape(-1, 1, 1))
+        leds[self._masks] = rgb[self._masks]
+
+    def get_panel_values(self, now: int) -> np.ndarray:
+        attack = (now - self._start) / 1e9 / self._att
+        decay = (now - self._end) / 1e9 / self._dec
+        attack = self.BASE_MAX * np.clip(attack, 0.0, 1.0)
+        decay = self.BASE_MAX * np.clip(1.0 - decay, 0.0, 1.0)
+        return np.where(self._active, attack, decay)
 
     @staticmethod
-    def hsv_to_rgb(hi: int, si: int, vi: int) -> tuple[int, int, int]:
+    def hsv_to_rgb(
+        hi: np.ndarray, si: int, vi: np.ndarray
+    ) -> np.ndarray:
         h = hi * 360.0 / 255.0
         s = si / 255.0
-        v = vi / 255.0
-
-        if s == 0.0:
-            r = g = b = int(v * 255)
-            return r, g, b
+        v = np.broadcast_to(vi / 255.0, h.shape)
 
-        i = int(h / 60.0) % 6
+        i = (h / 60.0).astype(np.int32) % 6
         f = (h / 60.0) - i
         p = v * (1.0 - s)
         q = v * (1.0 - s * f)
         t = v * (1.0 - s * (1.0 - f))
 
-        if i == 0:
-            r, g, b = v, t, p
-        elif i == 1:
-            r, g, b = q, v, p
-        elif i == 2:
-            r, g, b = p, v, t
-        elif i == 3:
-            r, g, b = p, q, v
-        elif i == 4:
-            r, g, b = t, p, v
-        else:
-            r, g, b = v, p, q
-        return int(r * 255), int(g * 255), int(b * 255)
+        r = np.choose(i, [v, q, p, p, t, v])
+        g = np.choose(i, [t, v, v, q, p, p])
+        b = np.choose(i, [p, p, t, v, v, q])
+        return (np.stack((r, g, b), axis=-1) * 255).astype(np.uint8)
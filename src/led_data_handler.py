@@ -1,7 +1,10 @@
+import time
 from multiprocessing.sharedctypes import SynchronizedArray
 from multiprocessing.synchronize import Event
 
-from led_data_generator import LEDDataGenerator
+import numpy as np
+
+from lighting_engine import LightingEngine
 from pad_model import PadModel
 
 
@@ -57,53 +60,78 @@ class LEDDataHandler:
         ]
     ]
 
-    def __init__(self, data: SynchronizedArray, event: Event, model: PadModel):
+    GAMMA_LUT = np.array(GAMMA, np.uint8)
+    CHANNELS = [1, 0, 2]
+    REPORT_BYTES = 64
+
+    @classmethod
+    def led_offsets(cls, led_shape: tuple[int, ...]) -> np.ndarray:
+        offsets = np.zeros(
+            (cls.NUM_PANELS, cls.NUM_SEGMENTS, cls.NUM_LEDS * 3), np.intp
+        )
+        for panel in range(cls.NUM_PANELS):
+            for segment, positions in enumerate(cls.POSITIONS):
+                for byte_index in range(cls.NUM_LEDS * 3):
+                    x, y = positions[byte_index // 3]
+                    channel = cls.CHANNELS[byte_index % 3]
+                    index = (panel, x, y, channel)
+                    offset = np.ravel_multi_index(index, led_shape)
+                    offsets[panel, segment, byte_index] = offset
+        return offsets.reshape(cls.NUM_PANELS * cls.NUM_SEGMENTS, -1)
+
+    def __init__(
+        self, data: SynchronizedArray, event: Event, model: PadModel,
+        engine: LightingEngine
+    ):
         self._data = data
-        self._generator = LEDDataGenerator(model)
+        self._engine = engine
         self._event = event
         self._model = model
         self._segment = -1
         self._panel = -1
         self._frame = -1
-        self._led_data = {}
-        self._frame_change = False
+        self._panel_change = False
+        self._offsets = self.led_offsets(model.get_led_array().shape)
+        num_reports = self.NUM_PANELS * self.NUM_SEGMENTS
+        self._reports = bytearray(num_reports * self.REPORT_BYTES)
+        self._report_memory = memoryview(self._reports)
+        self._report_view = np.frombuffer(self._reports, np.uint8).reshape(
+            num_reports, self.REPORT_BYTES
+        )
+        self._led_values = np.zeros(self._offsets.shape, np.uint8)
+        self._shared = memoryview(self._data.get_obj()).cast('B')
 
     def setup_frame_data(self) -> int:
         self._segment = (self._segment + 1) % self.NUM_SEGMENTS
         if self._segment == 0:
             self._panel = (self._panel + 1) % self.NUM_PANELS
             if self._panel == 0:
-                self._frame_change = True
                 self._frame = (self._frame + 1) % self.NUM_FRAMES
-                self._led_data = self._model.get_led_data()
+            self._panel_change = True
+            self.encode_panel(self._panel)
 
         return (self._panel << 6) | (self._segment << 4) | (self._frame)
 
-    def get_data_byte(self, byte_index: int) -> int:
-        panel_coord = PadModel.PANELS.coords[self._panel]
-        if (panel_data := self._led_data.get(panel_coord, None)) is None:
-            return 0
-        led_index = (byte_index // 3)
-        led_coord = self.POSITIONS[self._segment][led_index]
-        led = panel_data[led_coord]
-        if byte_index % 3 == 0:
-            col = led.green
-        elif byte_index % 3 == 1:
-            col = led.red
-        else:
-            col = led.blue
-        return self.GAMMA[col]
+    def encode_panel(self, panel: int) -> None:
+        start = panel * self.NUM_SEGMENTS
+        rows = slice(start, start + self.NUM_SEGMENTS)
+        values = self._led_values[rows]
+        leds = self._model.get_led_array().reshape(-1)
+        np.take(leds, self._offsets[rows], out=values)
+        np.take(self.GAMMA_LUT, values, out=values)
+        self._report_view[rows, 1:] = values
 
     def give_sample(self) -> None:
         if not self._event.is_set():
             return
         frame_byte = self.setup_frame_data()
-        led_data = [self.get_data_byte(i) for i in range(63)]
-        frame_data = [frame_byte, *led_data]
+        index = self._panel * self.NUM_SEGMENTS + self._segment
+        self._report_view[index, 0] = frame_byte
+        start = index * self.REPORT_BYTES
+        report = self._report_memory[start:start + self.REPORT_BYTES]
         with self._data.get_lock():
-            for index in range(64):
-                self._data[index] = frame_data[index]
-        if self._frame_change:
-            self._generator.update_led_frame()
-            self._frame_change = False
-        self._event.clear()
+            self._shared[:] = report
+            self._event.clear()
+        if self._panel_change:
+            self._engine.panel_lit(self._panel, time.monotonic_ns())
+            self._panel_change = False
@@ -0,0 +1,84 @@
+import abc
+import time
+
+import numpy as np
+
+from pad_model import Edges, PadModel
+from profiler import LatencyRecorder
+
+
+class LightingEffect(abc.ABC):
+    """Base class for effects drawn by the lighting engine."""
+
+    def on_press(self, panel: int, stamp: int) -> None:
+        pass
+
+    def on_release(self, panel: int, stamp: int) -> None:
+        pass
+
+    def animating(self, now: int) -> bool:
+        return False
+
+    @abc.abstractmethod
+    def render(self, now: int, leds: np.ndarray) -> None:
+        pass
+
+
+class LightingEngine:
+    """Renders lighting effects at a fixed rate from live panel edges."""
+
+    FRAME_RATE = 250.0
+
+    def __init__(
+        self, model: PadModel, latency: LatencyRecorder | None = None
+    ):
+        self._model = model
+        self._latency = latency
+        self._effects: list[LightingEffect] = []
+        num_panels = len(PadModel.PANELS.coords)
+        self._pressed_at = np.zeros(num_panels, np.uint64)
+        self._pending = np.zeros(num_panels, np.bool_)
+        self._rendered = np.zeros(num_panels, np.bool_)
+        self._animating = False
+
+    def subscribe(self, effect: LightingEffect) -> None:
+        self._effects.append(effect)
+
+    def handle_edges(self, edges: Edges, stamps: np.ndarray) -> None:
+        rows, panels, pressed = edges
+        for row, panel, state in zip(
+            rows.tolist(), panels.tolist(), pressed.tolist()
+        ):
+            stamp = int(stamps[row])
+            if state:
+                self._pressed_at[panel] = stamp
+                self._pending[panel] = True
+                self._rendered[panel] = False
+                for effect in self._effects:
+                    effect.on_press(panel, stamp)
+            else:
+                for effect in self._effects:
+                    effect.on_release(panel, stamp)
+        self._animating |= len(rows) > 0
+
+    def render(self, now: int | None = None) -> None:
+        now = time.monotonic_ns() if now is None else now
+        leds = self._model.get_led_array()
+        for effect in self._effects:
+            effect.render(now, leds)
+        self._rendered |= self._pending
+        self._animating = any(
+            effect.animating(now) for effect in self._effects
+        )
+
+    def panel_lit(self, panel: int, now: int) -> None:
+        if not self._rendered[panel]:
+            return
+        if self._latency is not None:
+            self._latency.record("light", now - int(self._pressed_at[panel]))
+        self._pending[panel] = False
+        self._rendered[panel] = False
+
+    @property
+    def animating(self) -> bool:
+        return self._animating
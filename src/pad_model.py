@@ -1,6 +1,10 @@
 import dataclasses
+import time
 
-import keyboard
+import numpy as np
+
+from key_output import KeyOutput
+from sensor_filter import SensorFilter
 
 Coord = tuple[int, int]
 Colour = tuple[int, int, int]
@@ -14,13 +18,30 @@ class Coords:
     coords: list[Coord]
 
 
-@dataclasses.dataclass
 class LEDEntry:
+    """View of a single LED colour in a PadEntry LED array."""
+
     B8_MAX = 255
 
-    red: int = 0
-    green: int = 0
-    blue: int = 0
+    def __init__(self, rgb: np.ndarray):
+        self._rgb = rgb
+
+    def __repr__(self) -> str:
+        return (
+            f"LEDEntry(red={self.red}, green={self.green}, blue={self.blue})"
+        )
+
+    @property
+    def red(self) -> int:
+        return int(self._rgb[0])
+
+    @property
+    def green(self) -> int:
+        return int(self._rgb[1])
+
+    @property
+    def blue(self) -> int:
+        return int(self._rgb[2])
 
     @property
     def colour(self) -> Colour:
@@ -28,50 +49,86 @@ class LEDEntry:
 
     @colour.setter
     def colour(self, colour: Colour):
-        self.red = int(max(0, min(colour[0], self.B8_MAX)))
-        self.green = int(max(0, min(colour[1], self.B8_MAX)))
-        self.blue = int(max(0, min(colour[2], self.B8_MAX)))
+        self._rgb[0] = int(max(0, min(colour[0], self.B8_MAX)))
+        self._rgb[1] = int(max(0, min(colour[1], self.B8_MAX)))
+        self._rgb[2] = int(max(0, min(colour[2], self.B8_MAX)))
 
 
-@dataclasses.dataclass
 class SensorEntry:
+    """View of a single sensor in the PadEntry sensor arrays."""
+
     MAX_ON = 100
     MAX_OFF = MAX_ON - 1
     B12_MAX = 4095
     MAX_BASE = B12_MAX - MAX_ON
+    DEFAULT_THRESHOLD = 30
+    DEFAULT_HYSTERESIS = 5
+
+    def __init__(self, pad: "PadEntry", index: tuple[int, int]):
+        self._pad = pad
+        self._index = index
+
+    def __repr__(self) -> str:
+        return (
+            f"SensorEntry(base_value={self.base_value}, "
+            f"current_value={self.current_value}, "
+            f"threshold={self.threshold}, hysteresis={self.hysteresis}, "
+            f"updated={self.updated}, active={self.active})"
+        )
+
+    @property
+    def base_value(self) -> int:
+        return int(self._pad.base[self._index])
+
+    @property
+    def current_value(self) -> int:
+        return int(self._pad.current[self._index])
+
+    @property
+    def threshold(self) -> int:
+        return int(self._pad.threshold[self._index])
+
+    @property
+    def hysteresis(self) -> int:
+        return int(self._pad.hysteresis[self._index])
 
-    base_value: int = 0
-    current_value: int = 0
-    threshold: int = 30
-    hysteresis: int = 5
-    updated: bool = True
-    _active: bool = False
+    @property
+    def updated(self) -> bool:
+        return bool(self._pad.sensors_updated[self._index])
+
+    @updated.setter
+    def updated(self, updated: bool):
+        self._pad.sensors_updated[self._index] = updated
 
     def set_base_value(self, base_value: int):
-        self.base_value = int(max(0, min(base_value, self.B12_MAX)))
+        base_value = int(max(0, min(base_value, self.B12_MAX)))
+        self._pad.base[self._index] = base_value
 
     def set_current_value(self, current_value: int):
-        self.current_value = int(max(0, min(current_value, self.MAX_BASE)))
+        current_value = int(max(0, min(current_value, self.MAX_BASE)))
+        self._pad.current[self._index] = current_value
         self.set_active()
 
     def set_threshold(self, threshold: int):
-        self.threshold = int(max(self.hysteresis, min(threshold, self.MAX_ON)))
+        threshold = int(max(self.hysteresis, min(threshold, self.MAX_ON)))
+        self._pad.threshold[self._index] = threshold
 
     def set_hysteresis(self, hysteresis: int):
-        self.hysteresis = int(max(1, min(hysteresis, self.threshold)))
+        hysteresis = int(max(1, min(hysteresis, self.threshold)))
+        self._pad.hysteresis[self._index] = hysteresis
 
     def set_active(self):
         delta = self.current_value - self.base_value
         pressed = delta >= self.threshold
         released = delta <= self.threshold - self.hysteresis
-        if not self._active and pressed:
-            self._active = True
-        elif self._active and released:
-            self._active = False
+        if not self.active and pressed:
+            self._pad.active[self._index] = True
+        elif self.active and released:
+            self._pad.active[self._index] = False
 
     @property
     def active(self) -> bool:
-        return self._active
+        return bool(self._pad.active[self._index])
 
     @property
     def profile_data(self) -> tuple[int, int]:
@@ -79,28 +136,44 @@ class SensorEntry:
 
     @profile_data.setter
     def profile_data(self, data: tuple[int, int]):
-        self.threshold = data[0]
-        self.hysteresis = data[1]
+        self._pad.threshold[self._index] = data[0]
+        self._pad.hysteresis[self._index] = data[1]
 
 
-@dataclasses.dataclass
 class PanelEntry:
-    sensors: dict[Coord, SensorEntry]
-    leds: dict[Coord, LEDEntry]
-    key_val: str
-    pressed: bool = False
-
-    def __init__(self, sensors: Coords, leds: Coords, key_val: str):
-        self.sensors = {coord: SensorEntry() for coord in sensors.coords}
-        self.leds = {coord: LEDEntry() for coord in leds.coords}
+    """View of a single arrow panel in the PadEntry arrays."""
+
+    def __init__(
+        self, pad: "PadEntry", index: int, sensors: Coords, leds: Coords,
+        key_val: str
+    ):
+        self._pad = pad
+        self._index = index
+        self.sensors = {
+            coord: SensorEntry(pad, (index, s_index))
+            for s_index, coord in enumerate(sensors.coords)
+        }
+        self.leds = {
+            coord: LEDEntry(pad.leds[index, coord[0], coord[1]])
+            for coord in leds.coords
+        }
         self.key_val = key_val
 
+    @property
+    def index(self) -> int:
+        return self._index
+
     @property
     def active(self) -> bool:
-        for sensor in self.sensors.values():
-            if sensor.active:
-                return True
-        return False
+        return bool(self._pad.active[self._index].any())
+
+    @property
+    def pressed(self) -> bool:
+        return bool(self._pad.pressed[self._index])
+
+    @pressed.setter
+    def pressed(self, pressed: bool):
+        self._pad.pressed[self._index] = pressed
 
     @property
     def profile_data(self) -> ProfilePanelData:
@@ -120,38 +193,43 @@ class PanelEntry:
 
     @profile_data.setter
     def profile_data(self, panel_data: ProfilePanelData):
-        self._profile_set = False
         for coord, data in self.sensors.items():
             data.profile_data = panel_data[0][coord]
         self.key_val = panel_data[1]
 
-    def set_frame_data(self, panel_data: "PanelEntry") -> None:
-        for coord, sensor in self.sensors.items():
-            sensor.set_base_value(panel_data.sensors[coord].base_value)
-            sensor.set_current_value(panel_data.sensors[coord].current_value)
-            sensor.set_hysteresis(panel_data.sensors[coord].hysteresis)
-            sensor.set_threshold(panel_data.sensors[coord].threshold)
-        for coord, led in self.leds.items():
-            led.colour = panel_data.leds[coord].colour
-
 
 SensorCoord = tuple[Coord, Coord]
 
 
-@dataclasses.dataclass
 class PadEntry:
-    blanks: list[Coord]
-    panels: dict[Coord, PanelEntry]
+    """Structure of arrays holding all sensor and LED data of a pad."""
 
     def __init__(
             self, blanks: Coords, panels: Coords, sensors: Coords,
             leds: Coords, keys: list[str]
     ):
+        num_panels = len(panels.coords)
+        shape = (num_panels, len(sensors.coords))
+        grid_x = max(coord[0] for coord in leds.coords) + 1
+        grid_y = max(coord[1] for coord in leds.coords) + 1
         self.blanks = blanks.coords
+        self.base = np.zeros(shape, np.int16)
+        self.current = np.zeros(shape, np.int16)
+        self.threshold = np.full(
+            shape, SensorEntry.DEFAULT_THRESHOLD, np.int16
+        )
+        self.hysteresis = np.full(
+            shape, SensorEntry.DEFAULT_HYSTERESIS, np.int16
+        )
+        self.active = np.zeros(shape, np.bool_)
+        self.sensors_updated = np.ones(shape, np.bool_)
+        self.pressed = np.zeros(num_panels, np.bool_)
+        self.leds = np.zeros((num_panels, grid_x, grid_y, 3), np.uint8)
         self.panels = {
-            coord: PanelEntry(sensors, leds, key)
-            for coord, key in zip(panels.coords, keys)
+            coord: PanelEntry(self, index, sensors, leds, key)
+            for index, (coord, key) in enumerate(zip(panels.coords, keys))
         }
+        self.panel_list = list(self.panels.values())
         self.updated = False
 
     @property
@@ -167,14 +245,114 @@ class PadEntry:
 
     def set_frame_data(self, pad_entry: "PadEntry") -> None:
         self.blanks = pad_entry.blanks
-        for coord, panel in self.panels.items():
-            panel.set_frame_data(pad_entry.panels[coord])
+        np.copyto(self.base, pad_entry.base)
+        np.copyto(self.current, pad_entry.current)
+        np.copyto(self.threshold, pad_entry.threshold)
+        np.copyto(self.hysteresis, pad_entry.hysteresis)
+        np.copyto(self.active, pad_entry.active)
+        np.copyto(self.leds, pad_entry.leds)
 
     def set_keys(self, keys: list[str]) -> None:
         for panel, key in zip(self.panels.values(), keys):
             panel.key = key
 
 
+Edges = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class BaselineTracker:
+    """Gated exponential moving average of each sensor's released level."""
+
+    TIME_CONSTANT = 30000
+    UPDATE_SAMPLES = 256
+
+    def __init__(self, base: np.ndarray):
+        self._alpha = 1.0 / self.TIME_CONSTANT
+        self._estimate = base.astype(np.float64)
+        self._powers = np.ones(1)
+        self._pending: list[tuple[np.ndarray, np.ndarray]] = []
+        self._num_pending = 0
+
+    def reset(self, base: np.ndarray) -> None:
+        np.copyto(self._estimate, base)
+        self._pending.clear()
+        self._num_pending = 0
+
+    def powers(self, count: int) -> np.ndarray:
+        if len(self._powers) <= count:
+            keep = 1.0 - self._alpha
+            self._powers = keep ** np.arange(2 * count + 1)
+        return self._powers
+
+    def update(
+        self, pad: "PadEntry", values: np.ndarray, released: np.ndarray
+    ) -> None:
+        self._pending.append((values, released))
+        self._num_pending += len(values)
+        if self._num_pending < self.UPDATE_SAMPLES:
+            return
+        count = self._num_pending
+        samples = np.concatenate([block[0] for block in self._pending])
+        gate = np.concatenate([block[1] for block in self._pending])
+        self._pending.clear()
+        self._num_pending = 0
+        samples = samples.reshape(count, -1)
+        gate = gate.reshape(count, -1)
+        estimate = self._estimate.reshape(-1)
+        powers = self.powers(count)
+        if gate.all():
+            estimate *= powers[count]
+            estimate += self._alpha * (powers[count - 1::-1] @ samples)
+        else:
+            gated = np.cumsum(gate, axis=0)
+            weights = powers[gated[-1] - gated]
+            weights *= gate
+            estimate *= powers[gated[-1]]
+            estimate += self._alpha * (weights * samples).sum(axis=0)
+        np.copyto(pad.base, np.rint(self._estimate), casting="unsafe")
+
+
+class ActivationEngine:
+    """Applies clamping and hysteresis to a block of sensor samples."""
+
+    RELEASE = 0
+    PRESS = 1
+    HOLD = -1
+
+    @staticmethod
+    def process(
+        pad: PadEntry, samples: np.ndarray,
+        tracker: BaselineTracker | None = None
+    ) -> Edges:
+        if len(samples) == 0:
+            empty = np.zeros(0, np.intp)
+            return empty, empty, np.zeros(0, np.bool_)
+        values = np.clip(samples, 0, SensorEntry.MAX_BASE).astype(np.int16)
+        delta = values - pad.base
+        transitions = np.full(values.shape, ActivationEngine.HOLD, np.int8)
+        released = delta <= pad.threshold - pad.hysteresis
+        transitions[released] = ActivationEngine.RELEASE
+        transitions[delta >= pad.threshold] = ActivationEngine.PRESS
+
+        rows = np.arange(len(values)).reshape(-1, 1, 1)
+        last = np.where(transitions != ActivationEngine.HOLD, rows, -1)
+        np.maximum.accumulate(last, axis=0, out=last)
+        latest = np.take_along_axis(transitions, np.maximum(last, 0), axis=0)
+        pressed = latest == ActivationEngine.PRESS
+        active = np.where(last >= 0, pressed, pad.active)
+
+        panels_active = active.any(axis=2)
+        previous = np.concatenate((pad.pressed[None], panels_active[:-1]))
+        edge_rows, edge_panels = np.nonzero(panels_active != previous)
+
+        np.copyto(pad.current, values[-1])
+        np.copyto(pad.active, active[-1])
+        np.copyto(pad.pressed, panels_active[-1])
+        if tracker is not None:
+            tracker.update(pad, values, released)
+        return edge_rows, edge_panels, panels_active[edge_rows, edge_panels]
+
+
 class PadModel:
     """Encapsulating class for panels."""
 
@@ -206,8 +384,12 @@ class PadModel:
     SENSORS = Coords([(1, 1), (1, 0), (0, 1), (0, 0)])
     LEDS = Coords(led_coords())
     KEYS = ['A', 'B', 'C', 'D']
+    KEY_SETS = [
+        KEYS, ['E', 'F', 'G', 'H'], ['I', 'J', 'K', 'L'], ['M', 'N', 'O', 'P']
+    ]
 
     def __init__(self):
+        self.key_output: KeyOutput | None = None
         self.set_default()
 
     def get_model_data(self) -> PadEntry:
@@ -216,6 +398,9 @@ class PadModel:
     def get_led_data(self) -> dict[Coord, dict[Coord, LEDEntry]]:
         return {c: p.leds for c, p in self._model.panels.items()}
 
+    def get_led_array(self) -> np.ndarray:
+        return self._model.leds
+
     def set_sensor(self, data: tuple[int, int, SensorCoord]) -> bool:
         self._model.updated = True
         sensor = self._model.panels[data[2][0]].sensors[data[2][1]]
@@ -227,23 +412,50 @@ class PadModel:
         return True
 
     def set_baseline(self, data: dict[tuple[Coord, Coord], int]) -> None:
-        for coords, value in data.items():
-            panel = coords[0]
-            sensor = coords[1]
-            self._model.panels[panel].sensors[sensor].set_base_value(value)
+        self.set_baseline_values(self.values_from_dict(data))
+
+    def set_baseline_values(self, values: np.ndarray) -> None:
+        values = values.reshape(self._model.base.shape)
+        np.clip(values, 0, SensorEntry.B12_MAX, out=self._model.base)
+        self._baseline.reset(self._model.base)
+        self._filter.reset()
 
     def set_sensor_data(self, data: dict[tuple[Coord, Coord], int]) -> None:
-        for coords, value in data.items():
-            panel = coords[0]
-            sensor = coords[1]
-            self._model.panels[panel].sensors[sensor].set_current_value(value)
-        for panel in self._model.panels.values():
-            if panel.active and not panel.pressed:
-                panel.pressed = True
-                keyboard.press(panel.key)
-            if not panel.active and panel.pressed:
-                panel.pressed = False
-                keyboard.release(panel.key)
+        self.set_sensor_values(self.values_from_dict(data))
+
+    def set_sensor_values(self, values: np.ndarray) -> Edges:
+        edges = self.activate(values)
+        self.emit_keys(edges)
+        return edges
+
+    def activate(self, values: np.ndarray) -> Edges:
+        samples = values.reshape(-1, *self._model.current.shape)
+        samples = self._filter.process(samples)
+        return ActivationEngine.process(self._model, samples, self._baseline)
+
+    def emit_keys(
+        self, edges: Edges, stamps: np.ndarray | None = None
+    ) -> None:
+        if self.key_output is None:
+            return
+        queued = time.monotonic_ns()
+        rows, panels, pressed = edges
+        for row, index, state in zip(
+            rows.tolist(), panels.tolist(), pressed.tolist()
+        ):
+            read = queued if stamps is None else int(stamps[row])
+            key = self._model.panel_list[index].key
+            self.key_output.emit(key, state, read, queued)
+
+    def values_from_dict(
+        self, data: dict[tuple[Coord, Coord], int]
+    ) -> np.ndarray:
+        values = self._model.current.copy()
+        for (panel, sensor), value in data.items():
+            p_index = self.PANELS.coords.index(panel)
+            s_index = self.SENSORS.coords.index(sensor)
+            values[p_index, s_index] = value
+        return values
 
     def set_saved(self) -> None:
         self._model.updated = False
@@ -252,11 +464,11 @@ class PadModel:
         self._model = PadEntry(
             self.BLANKS, self.PANELS, self.SENSORS, self.LEDS, self.KEYS
         )
+        self._baseline = BaselineTracker(self._model.base)
+        self._filter = SensorFilter()
 
     def view_updated(self) -> None:
-        for panel in self._model.panels.values():
-            for sensor in panel.sensors.values():
-                sensor.updated = False
+        self._model.sensors_updated[:] = False
 
     def keys_updated(self, keys: list[str]) -> None:
         self._model.set_keys(keys)
@@ -270,3 +482,15 @@ class PadModel:
     def profile_data(self, profile_data: ProfilePadData) -> None:
         self.set_saved()
         self._model.profile_data = profile_data
+
+    @property
+    def sensor_filter(self) -> SensorFilter:
+        return self._filter
+
+    @property
+    def filter_config(self) -> dict:
+        return self._filter.config
+
+    @filter_config.setter
+    def filter_config(self, config: dict) -> None:
+        self._filter = SensorFilter.create(config)
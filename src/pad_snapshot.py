@@ -0,0 +1,115 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from pad_model import PadEntry, PadModel
+
+
+class PadSnapshot:
+    """Shared memory copy of pad frame data guarded by a sequence lock."""
+
+    HEADER_BYTES = 16
+    NUM_PANELS = len(PadModel.PANELS.coords)
+    NUM_SENSORS = len(PadModel.SENSORS.coords)
+    GRID_X = max(coord[0] for coord in PadModel.LEDS.coords) + 1
+    GRID_Y = max(coord[1] for coord in PadModel.LEDS.coords) + 1
+    SENSOR_FIELDS = ["base", "current", "threshold", "hysteresis", "active"]
+    FIELDS = [
+        ("base", np.int16, (NUM_PANELS, NUM_SENSORS)),
+        ("current", np.int16, (NUM_PANELS, NUM_SENSORS)),
+        ("threshold", np.int16, (NUM_PANELS, NUM_SENSORS)),
+        ("hysteresis", np.int16, (NUM_PANELS, NUM_SENSORS)),
+        ("active", np.bool_, (NUM_PANELS, NUM_SENSORS)),
+        ("leds", np.uint8, (NUM_PANELS, GRID_X, GRID_Y, 3)),
+        ("updated", np.bool_, (1,))
+    ]
+
+    def __init__(self):
+        size = self.HEADER_BYTES + self.data_bytes()
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._owner = True
+        self._attach()
+        self._seq[0] = 0
+        self._generation[0] = 0
+        self._data[:] = 0
+
+    def __getstate__(self) -> dict:
+        return {"name": self._shm.name}
+
+    def __setstate__(self, state: dict) -> None:
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._owner = False
+        self._attach()
+
+    @classmethod
+    def data_bytes(cls) -> int:
+        return sum(
+            np.dtype(dtype).itemsize * int(np.prod(shape))
+            for _, dtype, shape in cls.FIELDS
+        )
+
+    @classmethod
+    def field_views(cls, data: np.ndarray) -> dict[str, np.ndarray]:
+        views = {}
+        offset = 0
+        for name, dtype, shape in cls.FIELDS:
+            nbytes = np.dtype(dtype).itemsize * int(np.prod(shape))
+            field = data[offset:offset + nbytes].view(dtype)
+            views[name] = field.reshape(shape)
+            offset += nbytes
+        return views
+
+    def _attach(self) -> None:
+        buf = self._shm.buf
+        self._seq = np.ndarray((1,), np.uint64, buf, 0)
+        self._generation = np.ndarray((1,), np.uint64, buf, 8)
+        shape = (self.data_bytes(),)
+        self._data = np.ndarray(shape, np.uint8, buf, self.HEADER_BYTES)
+        self._stage = np.zeros(shape, np.uint8)
+        self._stage_fields = self.field_views(self._stage)
+        self._scratch = np.zeros(shape, np.uint8)
+        self._read_fields = self.field_views(self._scratch)
+
+    def publish(self, entry: PadEntry) -> bool | None:
+        fields = self._stage_fields
+        for name in self.SENSOR_FIELDS:
+            np.copyto(fields[name], getattr(entry, name))
+        np.copyto(fields["leds"], entry.leds)
+        fields["updated"][0] = entry.updated
+        unchanged = np.array_equal(self._stage, self._data)
+        if unchanged and self._generation[0]:
+            return None
+        self._seq[0] += 1
+        np.copyto(self._data, self._stage)
+        self._generation[0] += 1
+        self._seq[0] += 1
+        return entry.updated
+
+    def read(self) -> dict[str, np.ndarray]:
+        while True:
+            start = int(self._seq[0])
+            if start % 2:
+                continue
+            np.copyto(self._scratch, self._data)
+            if int(self._seq[0]) == start:
+                return self._read_fields
+
+    def read_into(self, entry: PadEntry) -> bool:
+        fields = self.read()
+        for name in self.SENSOR_FIELDS:
+            np.copyto(getattr(entry, name), fields[name])
+        np.copyto(entry.leds, fields["leds"])
+        return bool(fields["updated"][0])
+
+    @property
+    def generation(self) -> int:
+        return int(self._generation[0])
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        del self._seq, self._generation, self._data
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
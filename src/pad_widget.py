@@ -2,7 +2,8 @@ import PySide6.QtCore as QtCore
 import PySide6.QtGui as QtGui
 import PySide6.QtOpenGLWidgets as QtOpenGLWidgets
 
-from pad_model import PadModel, PadEntry, Coord
+from pad_model import PadModel
+from pad_snapshot import PadSnapshot
 from pad_widget_view import PadWidgetView, SensorCoord
 
 
@@ -12,6 +13,7 @@ class PadWidget(QtOpenGLWidgets.QOpenGLWidget):
     FRAME_READY = QtCore.Signal()
     NEW_SENS_VALUE = QtCore.Signal()
     VIEW_UPDATED = QtCore.Signal()
+    SEND_INTERVAL_MS = 20
 
     def __init__(self):
         super(PadWidget, self).__init__()
@@ -23,6 +25,17 @@ class PadWidget(QtOpenGLWidgets.QOpenGLWidget):
         self._rect_coord = None
         self._button = None
         self._model = PadModel()
+        self._generation = None
+        self._frame_pending = False
+        self._held: tuple[int, int] | None = None
+        self._held_values = (0, 0)
+        self._sent_value = 0
+        self._unacknowledged = 0
+        self._send_timer = QtCore.QTimer(self)
+        self._send_timer.setSingleShot(True)
+        self._send_timer.setInterval(self.SEND_INTERVAL_MS)
+        self._send_timer.timeout.connect(self.send_sensor_value)
+        self.snapshot: PadSnapshot | None = None
 
     def initializeGL(self) -> None:
         self.view.init_painting(self._model.get_model_data())
@@ -31,12 +44,28 @@ class PadWidget(QtOpenGLWidgets.QOpenGLWidget):
         self.view.handle_resize_event(w, h)
 
     def paintGL(self) -> None:
-        self.view.draw_widget()
+        self.view.draw_widget(self.defaultFramebufferObject())
+        if self._frame_pending:
+            self._frame_pending = False
+            self.FRAME_READY.emit()
 
-    def update(self, frame_data: PadEntry) -> None:
-        self.view.set_frame_data(frame_data)
+    def update(self) -> None:
+        if self.snapshot is not None:
+            generation = self.snapshot.generation
+            if generation == self._generation:
+                return
+            self._generation = generation
+            self.view.set_frame_data(self.snapshot)
+            self._restore_held_sensor()
+        self._frame_pending = True
         super().update()
-        self.FRAME_READY.emit()
+
+    def changeEvent(self, event: QtCore.QEvent) -> None:
+        if event.type() in (
+            QtCore.QEvent.Type.PaletteChange, QtCore.QEvent.Type.StyleChange
+        ) and self.isValid():
+            self.view.invalidate_layers()
+        super().changeEvent(event)
 
     def mouseMoveEvent(self, event: QtGui.QMouseEvent) -> None:
         m_x = event.x()
@@ -56,28 +85,92 @@ class PadWidget(QtOpenGLWidgets.QOpenGLWidget):
             return
         self._mouse_y = m_y - self._last_mouse_y
         self._last_mouse_y = m_y
-        self.NEW_SENS_VALUE.emit()
+        self.edit_sensor(self._mouse_y)
 
     def mousePressEvent(self, event: QtGui.QMouseEvent) -> None:
         if (self._sensor_coord):
             self._dragging = True
             self._button = event.button()
             self._last_mouse_y = PadWidgetView.SIZE - event.y()
+            self._hold_sensor()
 
     def mouseReleaseEvent(self, event: QtGui.QMouseEvent) -> None:
-        self._dragging = False
+        if self._dragging:
+            self._dragging = False
+            self._send_timer.stop()
+            self.send_sensor_value()
+            if self._unacknowledged == 0:
+                self._held = None
         event.accept()
 
+    def edit_sensor(self, delta: int) -> None:
+        update = (self._update_id(), delta, self._sensor_coord)
+        self._model.set_sensor(update)
+        entry = self._model.get_model_data()
+        self._held_values = (
+            int(entry.threshold[self._held]),
+            int(entry.hysteresis[self._held])
+        )
+        self.view.update_sensor_thresholds()
+        super().update()
+        if not self._send_timer.isActive():
+            self._send_timer.start()
+
+    def send_sensor_value(self) -> None:
+        if self._held is None or self._held_value() == self._sent_value:
+            return
+        self._unacknowledged += 1
+        self.NEW_SENS_VALUE.emit()
+
+    def sensor_acknowledged(self) -> None:
+        self._unacknowledged = max(self._unacknowledged - 1, 0)
+        if not self._dragging and self._unacknowledged == 0:
+            self._held = None
+
     def get_update_data(self) -> tuple[int, int, SensorCoord] | None:
         if self._sensor_coord is None:
             return None
+        update_id = self._update_id()
+        value = self._held_value()
+        if update_id == 0:
+            delta = value - self._sent_value
+        else:
+            delta = self._sent_value - value
+        self._sent_value = value
+        return (update_id, delta, self._sensor_coord)
+
+    def _update_id(self) -> int:
         if self._button == QtCore.Qt.MouseButton.LeftButton:
-            update_id = 0
+            return 0
         elif self._button == QtCore.Qt.MouseButton.RightButton:
-            update_id = 1
-        else:
-            update_id = 2
-        return (update_id, self._mouse_y, self._sensor_coord)
+            return 1
+        return 2
+
+    def _held_value(self) -> int:
+        if self._update_id() == 1:
+            return self._held_values[1]
+        return self._held_values[0]
+
+    def _hold_sensor(self) -> None:
+        panel, sensor = self._sensor_coord
+        self._held = (
+            PadModel.PANELS.coords.index(panel),
+            PadModel.SENSORS.coords.index(sensor)
+        )
+        entry = self._model.get_model_data()
+        self._held_values = (
+            int(entry.threshold[self._held]),
+            int(entry.hysteresis[self._held])
+        )
+        self._sent_value = self._held_value()
+
+    def _restore_held_sensor(self) -> None:
+        if self._held is None:
+            return
+        entry = self._model.get_model_data()
+        entry.threshold[self._held], entry.hysteresis[self._held] = (
+            self._held_values
+        )
 
     def update_sensor_thresholds(self):
         self.view.update_sensor_thresholds()
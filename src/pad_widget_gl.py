@@ -1,4 +1,5 @@
 import ctypes
+from typing import Callable
 
 import numpy as np
 import OpenGL.GL as GL
@@ -8,65 +9,28 @@ Quad = tuple[int, int, int, int]
 Rgba = tuple[int, int, int, int] | None
 RectCoord = tuple[int, int, int, int]
 Gradient = tuple[Rgba, Rgba]
-
-
-class TexturePainter:
-    """Generic painter to map texture images to quads."""
-
-    @staticmethod
-    def load(path: str) -> tuple[bytes, int, int]:
-        image = Image.open(path)
-        conv_image = image.convert("RGBA")
-        image_data = conv_image.transpose(Image.FLIP_TOP_BOTTOM).tobytes()
-        image.close()
-        return (image_data, image.width, image.height)
-
-    @staticmethod
-    def set_data(image_data: bytes, width: int, height: int) -> int:
-        texture_id = GL.glGenTextures(1)
-        GL.glBindTexture(GL.GL_TEXTURE_2D, texture_id)
-        min_args = GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR
-        mag_args = GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR
-        GL.glTexParameteri(*min_args)
-        GL.glTexParameteri(*mag_args)
-        texture_params = GL.GL_TEXTURE_2D, 0, GL.GL_RGBA
-        dimensions = width, height, 0
-        pixel_data = GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, image_data
-        GL.glTexImage2D(*texture_params, *dimensions, *pixel_data)
-        return texture_id
-
-    @staticmethod
-    def draw(id: int, x: int, y: int, size: int, alpha: float) -> None:
-        GL.glEnable(GL.GL_TEXTURE_2D)
-        GL.glBindTexture(GL.GL_TEXTURE_2D, id)
-        GL.glColor4f(1.0, 1.0, 1.0, alpha)
-        GL.glBegin(GL.GL_QUADS)
-        for cx, cy in [(0, 0), (1, 0), (1, 1), (0, 1)]:
-            GL.glTexCoord2f(cx, cy)
-            GL.glVertex2f(x + size * cx, y + size * cy)
-        GL.glEnd()
-        GL.glDisable(GL.GL_TEXTURE_2D)
+Region = tuple[float, float, float, float]
 
 
 class RectShader:
     VERT = """
 #version 330 core
-#extension GL_ARB_separate_shader_objects : enable
 
-layout(location = 0) in vec2 aPos;
-layout(location = 1) in vec4 aColor;
+layout(location = 0) in vec3 aCorner;
+layout(location = 1) in vec4 aRect;
+layout(location = 2) in vec4 aColor;
+layout(location = 3) in vec4 aGradient;
+layout(location = 4) in float aHeight;
 
-layout(location = 0) out vec4 vertexColor;
+out vec4 vertexColor;
 
-const float maxX = 840.0;
-const float maxY = 840.0;
-const float maxC = 255.0;
+const vec2 viewSize = vec2(840.0, 840.0);
 
 void main() {
-    float normalizedX = (aPos.x / maxX) * 2.0 - 1.0;
-    float normalizedY = (aPos.y / maxY) * 2.0 - 1.0;
-    gl_Position = vec4(normalizedX, normalizedY, 0.0, 1.0);
-    vertexColor = aColor / maxC;
+    vec2 size = vec2(aRect.z - aRect.x, aHeight);
+    vec2 position = aRect.xy + aCorner.xy * size;
+    gl_Position = vec4(position / viewSize * 2.0 - 1.0, 0.0, 1.0);
+    vertexColor = mix(aColor, aGradient, aCorner.z);
 }
 """
 
@@ -103,8 +67,228 @@ void main() {
         return shader
 
 
+class TextureShader(RectShader):
+    VERT = """
+#version 330 core
+
+layout(location = 0) in vec2 aCorner;
+layout(location = 1) in vec4 aRect;
+layout(location = 2) in vec4 aRegion;
+layout(location = 3) in float aAlpha;
+
+out vec2 texCoord;
+flat out vec4 region;
+flat out float alpha;
+
+const vec2 viewSize = vec2(840.0, 840.0);
+
+void main() {
+    vec2 position = mix(aRect.xy, aRect.zw, aCorner);
+    gl_Position = vec4(position / viewSize * 2.0 - 1.0, 0.0, 1.0);
+    texCoord = mix(aRegion.xy, aRegion.zw, aCorner);
+    region = aRegion;
+    alpha = aAlpha;
+}
+"""
+
+    FRAG = """
+#version 330 core
+
+uniform sampler2D atlas;
+
+in vec2 texCoord;
+flat in vec4 region;
+flat in float alpha;
+out vec4 FragColor;
+
+void main() {
+    vec2 texel = 0.5 / vec2(textureSize(atlas, 0));
+    vec2 uv = clamp(texCoord, region.xy + texel, region.zw - texel);
+    FragColor = texture(atlas, uv) * vec4(1.0, 1.0, 1.0, alpha);
+}
+"""
+
+
+class TexturePainter:
+    """Instanced painter mapping regions of one texture atlas to quads."""
+
+    CORNERS = np.array([
+        [0, 0], [1, 0], [1, 1],
+        [0, 0], [1, 1], [0, 1]
+    ], np.float32)
+    INSTANCE_DTYPE = np.dtype([
+        ("rect", np.float32, 4),
+        ("region", np.float32, 4),
+        ("alpha", np.float32)
+    ])
+
+    def __init__(self, paths: list[str]):
+        images = [self.load(path) for path in paths]
+        width = max(image.shape[1] for image in images)
+        height = sum(image.shape[0] for image in images)
+        self._atlas = np.zeros((height, width, 4), np.uint8)
+        self._regions: list[Region] = []
+        y_pos = 0
+        for image in images:
+            image_height, image_width = image.shape[:2]
+            self._atlas[y_pos:y_pos + image_height, :image_width] = image
+            self._regions.append((
+                0.0, y_pos / height,
+                image_width / width, (y_pos + image_height) / height
+            ))
+            y_pos += image_height
+        self._instances = np.zeros(0, self.INSTANCE_DTYPE)
+        self._dirty = True
+        self._shader = None
+        self._vao = None
+
+    @staticmethod
+    def load(path: str) -> np.ndarray:
+        with Image.open(path) as image:
+            conv_image = image.convert("RGBA")
+        return np.asarray(conv_image.transpose(Image.FLIP_TOP_BOTTOM))
+
+    def allocate(
+        self, image: int, rects: list[RectCoord], alpha: float
+    ) -> slice:
+        start = len(self._instances)
+        instances = np.zeros(len(rects), self.INSTANCE_DTYPE)
+        instances["rect"] = rects
+        instances["region"] = self._regions[image]
+        instances["alpha"] = alpha
+        self._instances = np.concatenate((self._instances, instances))
+        self._dirty = True
+        return slice(start, start + len(rects))
+
+    def create_buffers(self) -> None:
+        self._shader = TextureShader()
+        self._texture = GL.glGenTextures(1)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self._texture)
+        for param, value in [
+            (GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR),
+            (GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR),
+            (GL.GL_TEXTURE_WRAP_S, GL.GL_CLAMP_TO_EDGE),
+            (GL.GL_TEXTURE_WRAP_T, GL.GL_CLAMP_TO_EDGE)
+        ]:
+            GL.glTexParameteri(GL.GL_TEXTURE_2D, param, value)
+        height, width = self._atlas.shape[:2]
+        texture_params = GL.GL_TEXTURE_2D, 0, GL.GL_RGBA8
+        dimensions = width, height, 0
+        pixel_data = GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, self._atlas
+        GL.glTexImage2D(*texture_params, *dimensions, *pixel_data)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        self._corner_vbo, self._instance_vbo = GL.glGenBuffers(2)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._corner_vbo)
+        GL.glBufferData(
+            GL.GL_ARRAY_BUFFER, self.CORNERS.nbytes, self.CORNERS,
+            GL.GL_STATIC_DRAW
+        )
+        self._vao = GL.glGenVertexArrays(1)
+        GL.glBindVertexArray(self._vao)
+        float_t = GL.GL_FLOAT
+        stride = self.CORNERS.strides[0]
+        Rect.setup_attribs(0, 2, float_t, GL.GL_FALSE, stride, 0, 0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._instance_vbo)
+        stride = self.INSTANCE_DTYPE.itemsize
+        fields = self.INSTANCE_DTYPE.fields
+        for idx, name, size in [
+            (1, "rect", 4), (2, "region", 4), (3, "alpha", 1)
+        ]:
+            offset = fields[name][1]
+            Rect.setup_attribs(
+                idx, size, float_t, GL.GL_FALSE, stride, offset, 1
+            )
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        GL.glBindVertexArray(0)
+
+    def upload(self) -> None:
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._instance_vbo)
+        GL.glBufferData(
+            GL.GL_ARRAY_BUFFER, self._instances.nbytes, self._instances,
+            GL.GL_STATIC_DRAW
+        )
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+        self._dirty = False
+
+    def render(self) -> None:
+        if self._vao is None:
+            self.create_buffers()
+        if len(self._instances) == 0:
+            return
+        if self._dirty:
+            self.upload()
+        GL.glUseProgram(self._shader.program)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self._texture)
+        GL.glBindVertexArray(self._vao)
+        GL.glDrawArraysInstanced(
+            GL.GL_TRIANGLES, 0, len(self.CORNERS), len(self._instances)
+        )
+        GL.glBindVertexArray(0)
+        GL.glBindTexture(GL.GL_TEXTURE_2D, 0)
+        GL.glUseProgram(0)
+
+
+class LayerCache:
+    """Offscreen framebuffer holding layers that only change on resize."""
+
+    def __init__(self):
+        self._fbo = None
+        self._renderbuffer = None
+        self._size = (0, 0)
+        self._valid = False
+
+    def invalidate(self) -> None:
+        self._valid = False
+
+    def resize(self, w: int, h: int) -> None:
+        if (w, h) != self._size:
+            self.release()
+            self._size = (w, h)
+        self._valid = False
+
+    def release(self) -> None:
+        if self._fbo is None:
+            return
+        GL.glDeleteFramebuffers(1, [self._fbo])
+        GL.glDeleteRenderbuffers(1, [self._renderbuffer])
+        self._fbo = None
+        self._renderbuffer = None
+
+    def create_buffers(self) -> None:
+        self._renderbuffer = GL.glGenRenderbuffers(1)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, self._renderbuffer)
+        GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, GL.GL_RGBA8, *self._size)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, 0)
+        self._fbo = GL.glGenFramebuffers(1)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._fbo)
+        GL.glFramebufferRenderbuffer(
+            GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_RENDERBUFFER,
+            self._renderbuffer
+        )
+        status = GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER)
+        if status != GL.GL_FRAMEBUFFER_COMPLETE:
+            self.release()
+            raise RuntimeError(f"Framebuffer incomplete: {status:#x}.")
+
+    def composite(self, paint: Callable[[], None], target: int) -> None:
+        if not self._valid:
+            if self._fbo is None:
+                self.create_buffers()
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._fbo)
+            GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+            paint()
+            self._valid = True
+        w, h = self._size
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, self._fbo)
+        GL.glBindFramebuffer(GL.GL_DRAW_FRAMEBUFFER, target)
+        GL.glBlitFramebuffer(
+            0, 0, w, h, 0, 0, w, h, GL.GL_COLOR_BUFFER_BIT, GL.GL_NEAREST
+        )
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, target)
+
+
 class Rect:
-    """Painter for rectangles with colour gradients."""
+    """Instanced painter for rectangles with colour gradients."""
 
     NO_ALPHA = 255
     DARK_GRAY = (10, 10, 10, NO_ALPHA)
@@ -122,67 +306,130 @@ class Rect:
     GREEN_GRAD = (LIGHT_GREEN, DARK_GREEN)
     BLUE_GRAD = (LIGHT_BLUE, DARK_BLUE)
 
-    UINT32_BYTES = 4
-    VERTEX_LEN = 6
-    STRIDE = UINT32_BYTES * VERTEX_LEN
+    CORNERS = np.array([
+        [0, 1, 1], [0, 0, 0], [1, 1, 0],
+        [1, 1, 0], [0, 0, 0], [1, 0, 1]
+    ], np.float32)
+    STATIC_DTYPE = np.dtype([("rect", np.float32, 4)])
+    DYNAMIC_DTYPE = np.dtype([
+        ("colour", np.uint8, 4),
+        ("gradient", np.uint8, 4),
+        ("height", np.float32)
+    ])
 
     def __init__(self):
-        self._vertex_data = []
-        self._shader = RectShader()
+        self._static = np.zeros(0, self.STATIC_DTYPE)
+        self._dynamic = np.zeros(0, self.DYNAMIC_DTYPE)
+        self._static_dirty = True
+        self._capacity = 0
+        self._shader = None
         self._vao = None
 
-    def draw(self, rect: RectCoord, col: Rgba, grad: Rgba = None) -> None:
-        if col is None:
-            return
-        self._vertex_data.extend([rect[0], rect[3]])
-        self._vertex_data.extend(grad if grad else col)
-        self._vertex_data.extend([rect[0], rect[1]])
-        self._vertex_data.extend(col)
-        self._vertex_data.extend([rect[2], rect[3]])
-        self._vertex_data.extend(col)
-        self._vertex_data.extend([rect[2], rect[3]])
-        self._vertex_data.extend(col)
-        self._vertex_data.extend([rect[0], rect[1]])
-        self._vertex_data.extend(col)
-        self._vertex_data.extend([rect[2], rect[1]])
-        self._vertex_data.extend(grad if grad else col)
-
-    def create_vbo(self):
-        dat = np.array(self._vertex_data, dtype=np.float32)
-        self._vbo = GL.glGenBuffers(1)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._vbo)
-        GL.glBufferData(GL.GL_ARRAY_BUFFER, dat.nbytes,
-                        dat, GL.GL_STATIC_DRAW)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+    def allocate(
+        self, rects: list[RectCoord], col: Rgba, grad: Rgba = None
+    ) -> slice:
+        start = len(self._static)
+        static = np.zeros(len(rects), self.STATIC_DTYPE)
+        dynamic = np.zeros(len(rects), self.DYNAMIC_DTYPE)
+        static["rect"] = rects
+        dynamic["colour"] = col
+        dynamic["gradient"] = grad if grad else col
+        dynamic["height"] = static["rect"][:, 3] - static["rect"][:, 1]
+        self._static = np.concatenate((self._static, static))
+        self._dynamic = np.concatenate((self._dynamic, dynamic))
+        self._static_dirty = True
+        return slice(start, start + len(rects))
 
-    def setup_attribs(self, idx: int, size: int):
-        val_t = GL.GL_FLOAT
-        norm = GL.GL_FALSE
-        pointer = ctypes.c_void_p(idx * 4 * 2)
+    def set_rect(self, index: int, rect: RectCoord) -> None:
+        self._static["rect"][index] = rect
+        self._dynamic["height"][index] = rect[3] - rect[1]
+        self._static_dirty = True
+
+    @property
+    def colour(self) -> np.ndarray:
+        return self._dynamic["colour"]
+
+    @property
+    def gradient(self) -> np.ndarray:
+        return self._dynamic["gradient"]
+
+    @property
+    def height(self) -> np.ndarray:
+        return self._dynamic["height"]
+
+    @staticmethod
+    def setup_attribs(
+        idx: int, size: int, val_t: int, norm: int, stride: int,
+        offset: int, divisor: int
+    ) -> None:
+        pointer = ctypes.c_void_p(offset)
         GL.glEnableVertexAttribArray(idx)
-        GL.glVertexAttribPointer(idx, size, val_t, norm, self.STRIDE, pointer)
+        GL.glVertexAttribPointer(idx, size, val_t, norm, stride, pointer)
+        GL.glVertexAttribDivisor(idx, divisor)
 
-    def create_vao(self):
+    def create_buffers(self) -> None:
+        self._shader = RectShader()
+        self._corner_vbo, self._static_vbo, self._dynamic_vbo = (
+            GL.glGenBuffers(3)
+        )
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._corner_vbo)
+        GL.glBufferData(
+            GL.GL_ARRAY_BUFFER, self.CORNERS.nbytes, self.CORNERS,
+            GL.GL_STATIC_DRAW
+        )
         self._vao = GL.glGenVertexArrays(1)
         GL.glBindVertexArray(self._vao)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._vbo)
-        self.setup_attribs(0, 2)
-        self.setup_attribs(1, 4)
+        float_t, ubyte_t = GL.GL_FLOAT, GL.GL_UNSIGNED_BYTE
+        stride = self.CORNERS.strides[0]
+        self.setup_attribs(0, 3, float_t, GL.GL_FALSE, stride, 0, 0)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._static_vbo)
+        stride = self.STATIC_DTYPE.itemsize
+        self.setup_attribs(1, 4, float_t, GL.GL_FALSE, stride, 0, 1)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._dynamic_vbo)
+        stride = self.DYNAMIC_DTYPE.itemsize
+        fields = self.DYNAMIC_DTYPE.fields
+        for idx, name, size, val_t, norm in [
+            (2, "colour", 4, ubyte_t, GL.GL_TRUE),
+            (3, "gradient", 4, ubyte_t, GL.GL_TRUE),
+            (4, "height", 1, float_t, GL.GL_FALSE)
+        ]:
+            offset = fields[name][1]
+            self.setup_attribs(idx, size, val_t, norm, stride, offset, 1)
         GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
         GL.glBindVertexArray(0)
 
+    def upload(self) -> None:
+        if self._capacity != len(self._static):
+            self._capacity = len(self._static)
+            for vbo, data, usage in [
+                (self._static_vbo, self._static, GL.GL_STATIC_DRAW),
+                (self._dynamic_vbo, self._dynamic, GL.GL_STREAM_DRAW)
+            ]:
+                GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vbo)
+                GL.glBufferData(GL.GL_ARRAY_BUFFER, data.nbytes, None, usage)
+            self._static_dirty = True
+        if self._static_dirty:
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._static_vbo)
+            GL.glBufferSubData(
+                GL.GL_ARRAY_BUFFER, 0, self._static.nbytes, self._static
+            )
+            self._static_dirty = False
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._dynamic_vbo)
+        GL.glBufferSubData(
+            GL.GL_ARRAY_BUFFER, 0, self._dynamic.nbytes, self._dynamic
+        )
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
     def render(self):
         if self._vao is None:
-            self.create_vbo()
-            self.create_vao()
-        dat = np.array(self._vertex_data, dtype=np.float32)
-        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._vbo)
-        GL.glBufferData(GL.GL_ARRAY_BUFFER, dat.nbytes,
-                        dat, GL.GL_STATIC_DRAW)
-        num_to_draw = len(self._vertex_data) // 6
+            self.create_buffers()
+        if len(self._static) == 0:
+            return
+        self.upload()
         GL.glUseProgram(self._shader.program)
         GL.glBindVertexArray(self._vao)
-        GL.glDrawArrays(GL.GL_TRIANGLES, 0, num_to_draw)
+        GL.glDrawArraysInstanced(
+            GL.GL_TRIANGLES, 0, len(self.CORNERS), len(self._static)
+        )
         GL.glBindVertexArray(0)
         GL.glUseProgram(0)
-        self._vertex_data = []
@@ -1,7 +1,9 @@
+import numpy as np
 import OpenGL.GL as GL
 
 from pad_model import PadEntry, PanelEntry, SensorEntry, LEDEntry, Coord
-from pad_widget_gl import Rect, TexturePainter, RectCoord
+from pad_snapshot import PadSnapshot
+from pad_widget_gl import LayerCache, Rect, RectCoord, TexturePainter
 
 
 LEDDict = dict[Coord, LEDEntry]
@@ -15,10 +17,17 @@ class PanelPainter:
 
     SIZE = 280
 
-    def __init__(self, coord: Coord, data: PanelEntry, rect: Rect):
+    def __init__(
+        self, coord: Coord, data: PanelEntry, pad: PadEntry,
+        background: Rect, rect: Rect
+    ):
         panel_pos = (coord[0] * self.SIZE, coord[1] * self.SIZE)
-        self._sensors = SensorPainter(panel_pos, data.sensors, rect)
-        self._leds = LEDGridPainter(panel_pos, data.leds, rect)
+        self._sensors = SensorPainter(
+            panel_pos, data.sensors, pad, data.index, background, rect
+        )
+        self._leds = LEDGridPainter(
+            panel_pos, data.leds, pad.leds[data.index], rect
+        )
         self._coord = coord
         self.draw()
 
@@ -43,12 +52,19 @@ class LEDGridPainter:
     LED_SIZE = int(GRID_SIZE / LED_NUM - LED_SPACE)
     LED_STEP = LED_SIZE + LED_SPACE
 
-    def __init__(self, panel: Coord, data: LEDDict, rect: Rect):
+    def __init__(
+        self, panel: Coord, data: LEDDict, leds: np.ndarray, rect: Rect
+    ):
         self._data = data
+        self._leds = leds
         self._panel_x = panel[0]
         self._panel_y = panel[1]
         self._rect = rect
         self._create_led_grid_base()
+        coords = np.array(list(self._data.keys()))
+        self._grid_x = coords[:, 0]
+        self._grid_y = coords[:, 1]
+        self._slots = rect.allocate(list(self._base.values()), Rect.DARK_GRAY)
 
     def _create_led_grid_base(self) -> None:
         grid_x = self._panel_x + self.GRID_OFFSET
@@ -62,8 +78,9 @@ class LEDGridPainter:
             self._base[coord] = (x1, y1, x2, y2)
 
     def draw(self) -> None:
-        for coord, led in self._data.items():
-            self._rect.draw(self._base[coord], (*led.colour, Rect.NO_ALPHA))
+        colours = self._leds[self._grid_x, self._grid_y]
+        self._rect.colour[self._slots, :3] = colours
+        self._rect.gradient[self._slots, :3] = colours
 
 
 class SensorPainter:
@@ -74,19 +91,34 @@ class SensorPainter:
     POS_X2 = PanelPainter.SIZE - WIDTH - POS_X1
     POS_Y2 = PanelPainter.SIZE - HEIGHT - POS_Y1
     MOUSE_PAD = 5
+    VALUE_GRADS = np.array([Rect.BLUE_GRAD, Rect.GREEN_GRAD], np.uint8)
 
-    def __init__(self, panel: Coord, data: SensorDict, rect: Rect):
+    def __init__(
+        self, panel: Coord, data: SensorDict, pad: PadEntry, index: int,
+        background: Rect, rect: Rect
+    ):
         self._data = data
+        self._base_values = pad.base[index]
+        self._current_values = pad.current[index]
+        self._active = pad.active[index]
         self._panel_x = panel[0]
         self._panel_y = panel[1]
         self._rect = rect
         self._create_sensors()
+        bases = list(self._base.values())
+        background.allocate(bases, *Rect.GRAY_GRAD)
+        self._value_slots = rect.allocate(bases, *Rect.BLUE_GRAD)
+        self._threshold_slots = rect.allocate(
+            list(self._threshold.values()), *Rect.RED_GRAD
+        )
 
     def update_thresholds(self) -> None:
-        for coord, sensor in self._data.items():
+        start = self._threshold_slots.start
+        for index, (coord, sensor) in enumerate(self._data.items()):
             if sensor.updated:
                 self._threshold[coord] = self._create_threshold(coord)
                 self._mouse_area[coord] = self._create_mouse_area(coord)
+                self._rect.set_rect(start + index, self._threshold[coord])
 
     def _create_sensors(self) -> None:
         self._base: dict[Coord, RectCoord] = {}
@@ -130,14 +162,13 @@ class SensorPainter:
         return x1, y1, x2, y2
 
     def draw(self) -> None:
-        for coord, sensor in self._data.items():
-            value_grad = Rect.GREEN_GRAD if sensor.active else Rect.BLUE_GRAD
-            delta_val = sensor.current_value - sensor.base_value
-            delta_pos = max(min(delta_val, self.HEIGHT), 0)
-            abs_pos = self._base[coord][1] + delta_pos
-            self._rect.draw(self._base[coord], *Rect.GRAY_GRAD)
-            self._rect.draw((*self._base[coord][0:3], abs_pos), *value_grad)
-            self._rect.draw(self._threshold[coord], *Rect.RED_GRAD)
+        delta = self._current_values - self._base_values
+        np.minimum(delta, self.HEIGHT, out=delta)
+        np.maximum(delta, 0, out=delta)
+        self._rect.height[self._value_slots] = delta
+        grads = self.VALUE_GRADS[self._active.view(np.uint8)]
+        self._rect.colour[self._value_slots] = grads[:, 0]
+        self._rect.gradient[self._value_slots] = grads[:, 1]
 
     @property
     def mouse_area(self) -> dict[Coord, RectCoord]:
@@ -150,38 +181,44 @@ class PadPainter:
     SIZE = PanelPainter.SIZE * 3
     GLOSS_PATH = "../assets/gloss-texture.jpg"
     METAL_PATH = "../assets/brushed-metal-texture.jpg"
+    METAL, GLOSS = range(2)
 
     def __init__(self, pad_data: PadEntry):
         self._pad_data = pad_data
+        self._background = Rect()
+        self._background.allocate(
+            [self.panel_rect(coord) for coord in pad_data.panels.keys()],
+            Rect.DARK_GRAY
+        )
         self._rect = Rect()
-
-        gloss = TexturePainter.load(self.GLOSS_PATH)
-        self.gloss_id = TexturePainter.set_data(*gloss)
-        metal = TexturePainter.load(self.METAL_PATH)
-        self.metal_id = TexturePainter.set_data(*metal)
+        self._textures = TexturePainter([self.METAL_PATH, self.GLOSS_PATH])
+        self._textures.allocate(
+            self.METAL, [self.panel_rect(c) for c in pad_data.blanks], 0.5
+        )
+        self._textures.allocate(
+            self.GLOSS, [(0, 0, self.SIZE, self.SIZE)], 0.2
+        )
         self.painters: list[PanelPainter] = []
         for coord, data in pad_data.panels.items():
-            self.painters.append(PanelPainter(coord, data, self._rect))
-
-    def draw_base(self) -> None:
-        for coord in self._pad_data.panels.keys():
-            x1 = coord[0] * PanelPainter.SIZE
-            y1 = coord[1] * PanelPainter.SIZE
-            x2 = x1 + PanelPainter.SIZE
-            y2 = y1 + PanelPainter.SIZE
-            self._rect.draw((x1, y1, x2, y2), Rect.DARK_GRAY)
-        for coord in self._pad_data.blanks:
-            x_pos = coord[0] * PanelPainter.SIZE
-            y_pos = coord[1] * PanelPainter.SIZE
-            args = self.metal_id, x_pos, y_pos, PanelPainter.SIZE, 0.5
-            TexturePainter.draw(*args)
+            self.painters.append(
+                PanelPainter(
+                    coord, data, pad_data, self._background, self._rect
+                )
+            )
+
+    @staticmethod
+    def panel_rect(coord: Coord) -> RectCoord:
+        x1 = coord[0] * PanelPainter.SIZE
+        y1 = coord[1] * PanelPainter.SIZE
+        return x1, y1, x1 + PanelPainter.SIZE, y1 + PanelPainter.SIZE
 
     def draw_panel_data(self) -> None:
         for painter in self.painters:
             painter.draw()
 
-    def draw_overlay(self) -> None:
-        TexturePainter.draw(self.gloss_id, 0, 0, self.SIZE, 0.2)
+    def render_static(self) -> None:
+        self._textures.render()
+        self._background.render()
 
     def render(self) -> None:
         self._rect.render()
@@ -197,20 +234,18 @@ class PadWidgetView:
         GL.glEnable(GL.GL_BLEND)
         GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
         self.painter = PadPainter(self._frame_data)
+        self._layers = LayerCache()
 
     def handle_resize_event(self, w: int, h: int) -> None:
         GL.glViewport(0, 0, w, h)
-        GL.glMatrixMode(GL.GL_PROJECTION)
-        GL.glLoadIdentity()
-        GL.glOrtho(0, w, 0, h, -1, 1)
-        GL.glMatrixMode(GL.GL_MODELVIEW)
-        GL.glLoadIdentity()
-
-    def draw_widget(self) -> None:
-        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
-        self.painter.draw_base()
+        self._layers.resize(w, h)
+
+    def invalidate_layers(self) -> None:
+        self._layers.invalidate()
+
+    def draw_widget(self, framebuffer: int = 0) -> None:
+        self._layers.composite(self.painter.render_static, framebuffer)
         self.painter.draw_panel_data()
-        self.painter.draw_overlay()
         self.painter.render()
 
     def mouse_in_sensor_area(self, x: int, y: int) -> SensorCoord:
@@ -220,8 +255,8 @@ class PadWidgetView:
                     return (panel_coord, sensor_coord)
         return None
 
-    def set_frame_data(self, frame_data: PadEntry) -> None:
-        self._frame_data.set_frame_data(frame_data)
+    def set_frame_data(self, snapshot: PadSnapshot) -> None:
+        snapshot.read_into(self._frame_data)
 
     def update_sensor_thresholds(self) -> None:
         for panel_painter in self.painter.painters:
@@ -0,0 +1,171 @@
+import multiprocessing
+import threading
+import time
+from multiprocessing.sharedctypes import SynchronizedArray
+from multiprocessing.synchronize import Event
+
+from key_output import KeyOutput, KeyOutputBackend, NullBackend
+from led_data_generator import LEDDataGenerator
+from led_data_handler import LEDDataHandler
+from lighting_engine import LightingEngine
+from pad_model import PadModel, ProfilePadData
+from pad_snapshot import PadSnapshot
+from profiler import LatencyRecorder
+from ring_buffer import ReportRingBuffer
+from sensor_data_handler import SensorDataHandler
+
+PadSettings = tuple[ProfilePadData, dict]
+
+
+class PadWorkerProcess(multiprocessing.Process):
+    """Runs activation, key output and lighting for one pad."""
+
+    SETTINGS = "settings"
+    LATENCY = "latency"
+    CLOSE = "close"
+    CLOSE_TIMEOUT_SECS = 1.0
+    READY_TIMEOUT_SECS = 5.0
+    NOT_READY = "Pad worker did not start"
+
+    def __init__(
+        self, ring: ReportRingBuffer, data: SynchronizedArray, event: Event,
+        settings: PadSettings, wake: Event, notify: Event
+    ):
+        super(PadWorkerProcess, self).__init__()
+        self._ring = ring
+        self._data = data
+        self._event = event
+        self._settings = settings
+        self._wake = wake
+        self._notify = notify
+        self._pipe, self._worker_pipe = multiprocessing.Pipe()
+        self._pipe_lock = threading.Lock()
+        self._snapshot = PadSnapshot()
+        self.start()
+        self._key_error = self.wait_ready()
+
+    def run(self) -> None:
+        self._model = PadModel()
+        self._latency = LatencyRecorder()
+        backend, error = self.open_backend()
+        self._model.key_output = KeyOutput(backend, self._latency)
+        self._worker_pipe.send(error)
+        self._sensors = SensorDataHandler(self._ring)
+        self._engine = LightingEngine(self._model, self._latency)
+        self._engine.subscribe(
+            LEDDataGenerator(self._model.get_led_array().shape)
+        )
+        self._lights = LEDDataHandler(
+            self._data, self._event, self._model, self._engine
+        )
+        self.apply_settings(self._settings)
+        try:
+            self.run_loop()
+        finally:
+            self._model.key_output.close()
+
+    @staticmethod
+    def open_backend() -> tuple[KeyOutputBackend, str]:
+        try:
+            return KeyOutput.default_backend(), ""
+        except OSError as e:
+            return NullBackend(), f"Key output unavailable: {e}"
+
+    def wait_ready(self) -> str:
+        if not self._pipe.poll(self.READY_TIMEOUT_SECS):
+            return self.NOT_READY
+        return self._pipe.recv()
+
+    def run_loop(self) -> None:
+        period = 1.0 / LightingEngine.FRAME_RATE
+        deadline = time.monotonic()
+        while self.handle_commands():
+            timeout = None
+            if self._engine.animating:
+                timeout = max(deadline - time.monotonic(), 0.0)
+            if self._wake.wait(timeout):
+                self._wake.clear()
+            self.handle_pad_data()
+            now = time.monotonic()
+            if not self._engine.animating:
+                deadline = now
+            elif now >= deadline:
+                self._engine.render()
+                deadline = max(deadline + period, now)
+            self.publish()
+
+    def handle_commands(self) -> bool:
+        while self._worker_pipe.poll():
+            command, data = self._worker_pipe.recv()
+            if command == self.SETTINGS:
+                self.apply_settings(data)
+            elif command == self.LATENCY:
+                self._worker_pipe.send((self._latency, self._ring.lost))
+            elif command == self.CLOSE:
+                return False
+        return True
+
+    def apply_settings(self, settings: PadSettings) -> None:
+        profile_data, filter_config = settings
+        self._model.profile_data = profile_data
+        if filter_config != self._model.filter_config:
+            self._model.filter_config = filter_config
+
+    def handle_pad_data(self) -> None:
+        self._sensors.take_sample()
+        if self._sensors.refreshed:
+            self._model.set_baseline_values(self._sensors.sample)
+        else:
+            stamps = self._sensors.stamps
+            edges = self._model.activate(self._sensors.samples)
+            stamps.activated = time.monotonic_ns()
+            self._model.emit_keys(edges, stamps.read)
+            stamps.queued = time.monotonic_ns()
+            self._latency.record_stamps(stamps, edges[0])
+            self._engine.handle_edges(edges, stamps.read)
+        self._lights.give_sample()
+
+    def publish(self) -> None:
+        entry = self._model.get_model_data()
+        if self._snapshot.publish(entry) is not None:
+            self._notify.set()
+
+    def send_settings(self, settings: PadSettings) -> None:
+        if not self.is_alive():
+            return
+        with self._pipe_lock:
+            self._pipe.send((self.SETTINGS, settings))
+        self._wake.set()
+
+    def request_latency(
+        self, timeout: float
+    ) -> tuple[LatencyRecorder, int] | None:
+        if not self.is_alive():
+            return None
+        with self._pipe_lock:
+            while self._pipe.poll():
+                self._pipe.recv()
+            self._pipe.send((self.LATENCY, None))
+            self._wake.set()
+            if not self._pipe.poll(timeout):
+                return None
+            return self._pipe.recv()
+
+    def close(self) -> None:
+        if self.is_alive():
+            with self._pipe_lock:
+                self._pipe.send((self.CLOSE, None))
+            self._wake.set()
+            self.join(self.CLOSE_TIMEOUT_SECS)
+        if self.is_alive():
+            self.terminate()
+            self.join()
+        self._snapshot.close()
+
+    @property
+    def snapshot(self) -> PadSnapshot:
+        return self._snapshot
+
+    @property
+    def key_error(self) -> str:
+        return self._key_error
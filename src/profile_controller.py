@@ -1,10 +1,12 @@
+import asyncio
 import pathlib
-import pickle
-import uuid
+from typing import Callable
 
 import appdirs
 
-from pad_model import PadModel
+from profile_format import ProfileFormat, ProfileFormatError, ProfileRecord
+from profile_store import ProfileStore, replace_file
+from reflex_controller import ReflexController
 
 
 class ProfileController:
@@ -13,62 +15,71 @@ class ProfileController:
     APP_NAME = "playground"
     APP_AUTHOR = "reflex_creations"
     UNNAMED_PREFIX = "Unnamed Profile"
+    FLUSH_TIMEOUT_SECS = 1.0
 
-    def __init__(self, pad_model: PadModel):
+    def __init__(self, pad_controller: ReflexController):
         profile_dir = appdirs.user_data_dir(
             self.APP_NAME, self.APP_AUTHOR, roaming=True
         )
         self.profile_path = pathlib.Path(profile_dir)
-        if not pathlib.Path.exists(self.profile_path):
-            pathlib.Path.mkdir(self.profile_path, parents=True)
+        self._store: ProfileStore | None = None
         self._saved_data = {}
-        self._model = pad_model
-
-    def _load_profile_map(self) -> None:
-        self._profile_map = {}
-        for profile_file in self.profile_path.glob("*.pkl"):
-            with open(profile_file, 'rb') as f:
-                data = pickle.load(f)
-                self._profile_map[data[0]] = profile_file
-
-    def initialise_profile(self) -> list[str]:
-        self._load_profile_map()
-        if names := self.get_profile_names():
-            self.load_user_profile(names[0])
+        self._controller = pad_controller
+        self.on_saved: Callable[[bool], None] | None = None
+
+    @property
+    def store(self) -> ProfileStore:
+        if self._store is None or self._store.path != self.profile_path:
+            if self._store is not None:
+                self._store.close()
+            self._store = ProfileStore(
+                self.profile_path, on_written=self._profile_written
+            )
+        return self._store
+
+    def _profile_written(self, name: str, success: bool) -> None:
+        if self.on_saved is not None:
+            self.on_saved(success)
+
+    def flush_profiles(self) -> None:
+        if self._store is not None:
+            self._store.flush(self.FLUSH_TIMEOUT_SECS)
+
+    async def initialise_profile(self) -> list[str]:
+        if names := await asyncio.to_thread(self.get_profile_names):
+            await self.load_user_profile(names[0])
         else:
             name = self.create_new_profile()
             names = [name]
-            self.load_user_profile(name)
+            await self.load_user_profile(name)
         return names
 
-    def save_user_profile(self, name: str) -> bool:
-        if name in self._profile_map:
-            profile_path = self._profile_map[name]
-        else:
-            profile_path = self.profile_path / f"{str(uuid.uuid4())}.pkl"
-        data = (name, self._model.profile_data)
-        with open(profile_path, 'wb') as f:
-            pickle.dump(data, f)
-        self._load_profile_map()
+    def save_user_profile(self, name: str) -> None:
+        model = self._controller.model
+        data = (name, model.profile_data, model.filter_config)
+        self.store.save(name, data)
         self._saved_data = data[1]
-        self._model.set_saved()
-        return True
+        model.set_saved()
+        self._controller.profile = name
 
-    def load_user_profile(self, name: str) -> str:
-        self._load_profile_map()
-        profile_path = self._profile_map.get(name)
-        if not profile_path:
-            raise ValueError(f"No profile found for {name}.")
-        with open(profile_path, 'rb') as f:
-            data = pickle.load(f)
+    async def load_user_profile(self, name: str) -> str:
+        data = await asyncio.to_thread(self.store.load, name)
+        return self.apply_user_profile(name, data)
+
+    def apply_user_profile(self, name: str, data: ProfileRecord) -> str:
         self._saved_data = data[1]
-        self._model.profile_data = self._saved_data
+        self._controller.model.profile_data = self._saved_data
+        if len(data) > 2:
+            self._controller.model.filter_config = data[2]
+        else:
+            self._controller.model.filter_config = {}
+        self._controller.profile = name
         return name
 
     def create_new_profile(self) -> str:
         index = 1
         profile_name = None
-        while profile_name in self.get_profile_names() or profile_name is None:
+        while profile_name in self.store or profile_name is None:
             profile_name = f"{self.UNNAMED_PREFIX} {index}"
             index += 1
         self.save_user_profile(profile_name)
@@ -77,40 +88,70 @@ class ProfileController:
     def handle_keys(self, values: tuple[bool, list[str], str]) -> None:
         if not values[0]:
             return
-        self._model.keys_updated(values[1])
+        self._controller.model.keys_updated(values[1])
         self.save_user_profile(values[2])
 
+    def handle_filter(self, values: tuple[dict, str]) -> None:
+        self._controller.model.filter_config = values[0]
+        self.save_user_profile(values[1])
+
+    def get_filter_config(self, *_) -> dict:
+        return self._controller.model.filter_config
+
     def rename_user_profile(
         self, old: str, new_name: tuple[bool, str]
     ) -> tuple[str, str]:
         if not new_name[0]:
             return (old, old)
         new = new_name[1]
-        if new.isspace() or new == "" or new in self.get_profile_names():
+        if new.isspace() or new == "" or new in self.store:
             return (old, old)
-        if not self._profile_map:
-            raise RuntimeError("Profile map not available.")
-        profile_path = self._profile_map.get(old)
-        if not profile_path:
-            raise ValueError(f"{profile_path} not found.")
-        self._profile_map.pop(old)
-        self._profile_map[new] = profile_path
+        self.store.rename(old, new)
         self.save_user_profile(new)
         return (old, new)
 
-    def remove_user_profile(self, name: str) -> bool:
-        if not self._profile_map:
+    async def remove_user_profile(self, name: str) -> bool:
+        if not self.store.remove(name):
             return False
-        profile_path = self._profile_map.get(name, None)
-        if not (profile_path and pathlib.Path.exists(profile_path)):
-            return False
-        pathlib.Path.unlink(profile_path)
-        self._load_profile_map()
-        self.load_user_profile(self.get_profile_names()[0])
+        await self.load_user_profile(self.get_profile_names()[0])
         return True
 
+    async def import_profiles(
+        self, path: str
+    ) -> tuple[list[str], str, str] | None:
+        if not path:
+            return None
+        try:
+            records = await asyncio.to_thread(self.read_library, path)
+        except (OSError, ProfileFormatError) as e:
+            return (self.get_profile_names(), self._controller.profile, str(e))
+        self.store.save_many(records)
+        if self._controller.profile in {record[0] for record in records}:
+            await self.load_user_profile(self._controller.profile)
+        return (self.get_profile_names(), self._controller.profile, "")
+
+    @staticmethod
+    def read_library(path: str) -> list[ProfileRecord]:
+        with open(path, 'rb') as f:
+            return ProfileFormat.decode_library(f.read())
+
+    def export_profiles(self, path: str) -> str | None:
+        if not path:
+            return None
+        library = ProfileFormat.encode_library(self.store.records())
+        try:
+            replace_file(pathlib.Path(path), library, sync=True)
+        except OSError as e:
+            return str(e)
+        return ""
+
+    def get_pad_profile(self, serial: str) -> str | None:
+        if pad := self._controller.pads.get(serial):
+            return pad.profile
+        return self._controller.profile
+
     def get_profile_names(self) -> list[str]:
-        return sorted(list(self._profile_map.keys()))
+        return self.store.names()
 
     def get_saved_data(self) -> dict:
         return self._saved_data
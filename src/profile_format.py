@@ -0,0 +1,149 @@
+import json
+import pickle
+
+from pad_model import PadModel, ProfilePadData, SensorEntry
+from sensor_filter import SensorFilter
+
+ProfileRecord = tuple[str, ProfilePadData, dict]
+
+
+class ProfileFormatError(ValueError):
+    """Raised when profile data does not match the profile schema."""
+
+
+class ProfileFormat:
+    """Versioned JSON encoding of profiles and profile libraries."""
+
+    KIND = "reflex-profile"
+    LIBRARY_KIND = "reflex-profile-library"
+    VERSION = 1
+    EXTENSION = ".json"
+    LEGACY_EXTENSION = ".pkl"
+    NUM_PANELS = len(PadModel.PANELS.coords)
+    NUM_SENSORS = len(PadModel.SENSORS.coords)
+
+    @staticmethod
+    def require(condition: bool, message: str) -> None:
+        if not condition:
+            raise ProfileFormatError(message)
+
+    @classmethod
+    def to_dict(cls, record: ProfileRecord) -> dict:
+        name, pad_data, *rest = record
+        panels = [pad_data[coord] for coord in PadModel.PANELS.coords]
+        sensors = [
+            [panel[0][coord] for coord in PadModel.SENSORS.coords]
+            for panel in panels
+        ]
+        return {
+            "kind": cls.KIND,
+            "version": cls.VERSION,
+            "name": name,
+            "keys": [panel[1] for panel in panels],
+            "threshold": [[int(s[0]) for s in panel] for panel in sensors],
+            "hysteresis": [[int(s[1]) for s in panel] for panel in sensors],
+            "filter": dict(rest[0]) if rest else SensorFilter().config
+        }
+
+    @classmethod
+    def check_grid(cls, data: dict, field: str) -> list[list[int]]:
+        grid = data.get(field)
+        cls.require(
+            isinstance(grid, list) and len(grid) == cls.NUM_PANELS and all(
+                isinstance(row, list) and len(row) == cls.NUM_SENSORS and
+                all(type(value) is int for value in row)
+                for row in grid
+            ),
+            f"{field} must be {cls.NUM_PANELS} lists of "
+            f"{cls.NUM_SENSORS} integers."
+        )
+        return grid
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ProfileRecord:
+        cls.require(isinstance(data, dict), "Profile must be an object.")
+        cls.require(data.get("kind") == cls.KIND, "Not a RE:Flex profile.")
+        version = data.get("version")
+        cls.require(
+            type(version) is int and 1 <= version <= cls.VERSION,
+            f"Unsupported profile version {version}."
+        )
+        name = data.get("name")
+        cls.require(
+            isinstance(name, str) and name.strip() != "",
+            "Profile name must be a non-empty string."
+        )
+        keys = data.get("keys")
+        cls.require(
+            isinstance(keys, list) and len(keys) == cls.NUM_PANELS and
+            all(isinstance(key, str) for key in keys),
+            f"keys must be a list of {cls.NUM_PANELS} strings."
+        )
+        thresholds = cls.check_grid(data, "threshold")
+        hystereses = cls.check_grid(data, "hysteresis")
+        for threshold, hysteresis in zip(
+            sum(thresholds, []), sum(hystereses, [])
+        ):
+            cls.require(
+                1 <= hysteresis <= threshold <= SensorEntry.MAX_ON,
+                f"Sensor needs 1 <= hysteresis <= threshold <= "
+                f"{SensorEntry.MAX_ON}, got {hysteresis}, {threshold}."
+            )
+        filter_config = data.get("filter", {})
+        try:
+            filter_config = SensorFilter.create(filter_config).config
+        except (TypeError, ValueError) as e:
+            raise ProfileFormatError(f"Invalid filter: {e}") from e
+        pad_data = {
+            panel: (
+                {
+                    sensor: (thresholds[p][s], hystereses[p][s])
+                    for s, sensor in enumerate(PadModel.SENSORS.coords)
+                },
+                keys[p]
+            )
+            for p, panel in enumerate(PadModel.PANELS.coords)
+        }
+        return (name, pad_data, filter_config)
+
+    @classmethod
+    def encode(cls, record: ProfileRecord) -> bytes:
+        return json.dumps(cls.to_dict(record), separators=(",", ":")).encode()
+
+    @classmethod
+    def decode(cls, data: bytes) -> ProfileRecord:
+        try:
+            return cls.from_dict(json.loads(data))
+        except json.JSONDecodeError as e:
+            raise ProfileFormatError(f"Invalid profile JSON: {e}") from e
+
+    @classmethod
+    def encode_library(cls, records: list[ProfileRecord]) -> bytes:
+        library = {
+            "kind": cls.LIBRARY_KIND,
+            "version": cls.VERSION,
+            "profiles": [cls.to_dict(record) for record in records]
+        }
+        return json.dumps(library, separators=(",", ":")).encode()
+
+    @classmethod
+    def decode_library(cls, data: bytes) -> list[ProfileRecord]:
+        try:
+            library = json.loads(data)
+        except json.JSONDecodeError as e:
+            raise ProfileFormatError(f"Invalid profile JSON: {e}") from e
+        if isinstance(library, dict) and library.get("kind") == cls.KIND:
+            return [cls.from_dict(library)]
+        cls.require(
+            isinstance(library, dict) and
+            library.get("kind") == cls.LIBRARY_KIND,
+            "Not a RE:Flex profile library."
+        )
+        profiles = library.get("profiles")
+        cls.require(isinstance(profiles, list), "profiles must be a list.")
+        return [cls.from_dict(profile) for profile in profiles]
+
+    @classmethod
+    def migrate_legacy(cls, data: bytes) -> ProfileRecord:
+        record = pickle.loads(data)
+        return cls.from_dict(cls.to_dict(record))
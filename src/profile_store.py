@@ -0,0 +1,313 @@
+import collections
+import json
+import os
+import pathlib
+import pickle
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from typing import Callable
+
+from profile_format import ProfileFormat, ProfileFormatError, ProfileRecord
+
+WrittenCallback = Callable[[str, bool], None]
+
+
+def replace_file(path: pathlib.Path, data: bytes, sync: bool = False) -> None:
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class ProfileWriter:
+    """Background thread that coalesces and syncs profile file writes."""
+
+    COALESCE_SECS = 0.05
+
+    def __init__(
+        self, directory: pathlib.Path,
+        on_written: WrittenCallback | None = None
+    ):
+        self._directory = directory
+        self._on_written = on_written
+        self._pending: dict[pathlib.Path, tuple[bytes | None, str]] = {}
+        self._writing: dict[pathlib.Path, tuple[bytes | None, str]] = {}
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(
+        self, path: pathlib.Path, data: bytes | None, name: str = ""
+    ) -> None:
+        with self._condition:
+            self._pending[path] = (data, name)
+            self._condition.notify_all()
+
+    def pending(self, path: pathlib.Path) -> bytes | None:
+        with self._condition:
+            entry = self._pending.get(path) or self._writing.get(path)
+        return None if entry is None else entry[0]
+
+    def flush(self, timeout: float | None = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not (
+                    (self._pending or self._writing) and
+                    self._thread.is_alive()
+                ),
+                timeout
+            )
+
+    def close(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending or not self._running
+                )
+                if not self._pending:
+                    return
+            time.sleep(self.COALESCE_SECS)
+            with self._condition:
+                self._writing, self._pending = self._pending, {}
+            try:
+                results = self._write_batch(self._writing)
+                if self._on_written is not None:
+                    for name, success in results.items():
+                        self._on_written(name, success)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                with self._condition:
+                    self._writing = {}
+                    self._condition.notify_all()
+
+    def _write_batch(
+        self, batch: dict[pathlib.Path, tuple[bytes | None, str]]
+    ) -> dict[str, bool]:
+        results = {}
+        for path, (data, name) in batch.items():
+            try:
+                if data is None:
+                    path.unlink(missing_ok=True)
+                else:
+                    replace_file(path, data, sync=True)
+                success = True
+            except OSError:
+                success = False
+            if name:
+                results[name] = results.get(name, True) and success
+        try:
+            self._sync_directory()
+        except OSError:
+            results = dict.fromkeys(results, False)
+        return results
+
+    def _sync_directory(self) -> None:
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self._directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class ProfileStore:
+    """Indexed profile files with an in-memory LRU of decoded profiles."""
+
+    INDEX_NAME = "index.json"
+    INDEX_VERSION = 2
+    CACHE_SIZE = 64
+    LEGACY_SUFFIX = "legacy"
+
+    def __init__(
+        self, path: pathlib.Path, cache_size: int = CACHE_SIZE,
+        on_written: WrittenCallback | None = None
+    ):
+        self.path = pathlib.Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._writer = ProfileWriter(self.path, on_written)
+        self._cache_size = cache_size
+        self._cache: collections.OrderedDict[str, ProfileRecord] = (
+            collections.OrderedDict()
+        )
+        self._files: dict[str, str] = {}
+        self._load_index()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def names(self) -> list[str]:
+        return sorted(self._files)
+
+    def load(self, name: str) -> ProfileRecord:
+        if (record := self._cache.get(name)) is not None:
+            self._cache.move_to_end(name)
+            return record
+        if (file_name := self._files.get(name)) is None:
+            raise ValueError(f"No profile found for {name}.")
+        path = self.path / file_name
+        if (data := self._writer.pending(path)) is not None:
+            record = self.decode(data)
+        else:
+            record = self.read_file(path)
+        self._cache_record(name, record)
+        return record
+
+    def save(self, name: str, record: ProfileRecord) -> None:
+        if self._store_record(name, record, name):
+            self._write_index()
+
+    def save_many(self, records: list[ProfileRecord]) -> None:
+        added = False
+        for record in records:
+            added |= self._store_record(record[0], record, "")
+        if added:
+            self._write_index()
+
+    def _store_record(
+        self, name: str, record: ProfileRecord, notify_name: str
+    ) -> bool:
+        added = (file_name := self._files.get(name)) is None
+        if added:
+            file_name = f"{uuid.uuid4()}{ProfileFormat.EXTENSION}"
+            self._files[name] = file_name
+        data = self.encode(record)
+        self._writer.write(self.path / file_name, data, notify_name)
+        self._cache_record(name, record)
+        return added
+
+    def rename(self, old: str, new: str) -> None:
+        if (file_name := self._files.pop(old, None)) is None:
+            raise ValueError(f"No profile found for {old}.")
+        self._files[new] = file_name
+        self._cache.pop(old, None)
+        self._write_index()
+
+    def remove(self, name: str) -> bool:
+        if (file_name := self._files.pop(name, None)) is None:
+            return False
+        self._cache.pop(name, None)
+        self._writer.write(self.path / file_name, None)
+        self._write_index()
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def records(self) -> list[ProfileRecord]:
+        return [self.load(name) for name in self.names()]
+
+    def encode(self, record: ProfileRecord) -> bytes:
+        return ProfileFormat.encode(record)
+
+    def decode(self, data: bytes) -> ProfileRecord:
+        return ProfileFormat.decode(data)
+
+    def read_file(self, path: pathlib.Path) -> ProfileRecord:
+        with open(path, 'rb') as f:
+            return self.decode(f.read())
+
+    def _cache_record(self, name: str, record: ProfileRecord) -> None:
+        self._cache[name] = record
+        self._cache.move_to_end(name)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _load_index(self) -> None:
+        try:
+            with open(self.path / self.INDEX_NAME) as f:
+                index = json.load(f)
+            if index.get("version") == self.INDEX_VERSION:
+                self._files = dict(index["profiles"])
+        except (OSError, ValueError, KeyError, TypeError):
+            self._files = {}
+        on_disk = {
+            path.name for path in self.path.glob(f"*{ProfileFormat.EXTENSION}")
+            if path.name != self.INDEX_NAME
+        }
+        stale = {
+            name: file_name for name, file_name in self._files.items()
+            if file_name not in on_disk
+        }
+        unindexed = on_disk - set(self._files.values())
+        for name in stale:
+            del self._files[name]
+        for file_name in sorted(unindexed):
+            try:
+                record = self.read_file(self.path / file_name)
+            except ProfileFormatError:
+                continue
+            self._files[record[0]] = file_name
+        migrated = self._migrate_legacy()
+        if stale or unindexed or migrated:
+            self._write_index()
+
+    def _migrate_legacy(self) -> bool:
+        migrated = False
+        legacy = self.path.glob(f"*{ProfileFormat.LEGACY_EXTENSION}")
+        for path in sorted(legacy):
+            try:
+                with open(path, 'rb') as f:
+                    record = ProfileFormat.migrate_legacy(f.read())
+            except (
+                OSError, EOFError, ValueError, TypeError, KeyError,
+                IndexError, pickle.UnpicklingError
+            ):
+                continue
+            name = self._legacy_name(record[0])
+            record = (name, *record[1:])
+            file_name = f"{uuid.uuid4()}{ProfileFormat.EXTENSION}"
+            try:
+                replace_file(
+                    self.path / file_name, self.encode(record), sync=True
+                )
+            except OSError:
+                continue
+            self._files[name] = file_name
+            migrated = True
+            try:
+                path.unlink()
+            except OSError:
+                traceback.print_exc()
+        return migrated
+
+    def _legacy_name(self, name: str) -> str:
+        if name not in self._files:
+            return name
+        candidate = f"{name} ({self.LEGACY_SUFFIX})"
+        index = 2
+        while candidate in self._files:
+            candidate = f"{name} ({self.LEGACY_SUFFIX} {index})"
+            index += 1
+        return candidate
+
+    def _write_index(self) -> None:
+        index = {"version": self.INDEX_VERSION, "profiles": self._files}
+        data = json.dumps(index, indent=1, sort_keys=True).encode()
+        self._writer.write(self.path / self.INDEX_NAME, data)
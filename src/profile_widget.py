@@ -2,6 +2,8 @@ import PySide6.QtCore as QtCore
 import PySide6.QtGui as QtGui
 import PySide6.QtWidgets as QtWidgets
 
+from sensor_filter import FILTERS, SensorFilter
+
 
 class ProfileNameDialog(QtWidgets.QDialog):
     """Dialog to re-name a user profile."""
@@ -78,8 +80,22 @@ class ProfileWidget(QtWidgets.QWidget):
     REMOVE_ICON = QtWidgets.QStyle.StandardPixmap.SP_DialogDiscardButton
     RENAME_ICON = QtWidgets.QStyle.StandardPixmap.SP_FileDialogDetailedView
     KEYS_ICON = QtWidgets.QStyle.StandardPixmap.SP_FileDialogListView
+    IMPORT_ICON = QtWidgets.QStyle.StandardPixmap.SP_ArrowDown
+    EXPORT_ICON = QtWidgets.QStyle.StandardPixmap.SP_ArrowUp
 
     LABEL_STR = "Profile:"
+    FILTER_LABEL_STR = "Filter:"
+    IMPORT_STR = "Import profiles"
+    EXPORT_STR = "Export profile library"
+    EXPORT_FILE = "profiles.json"
+    LIBRARY_FILTER = "Profile library (*.json)"
+    TRANSFER_ERROR_TITLE = "Profile library"
+
+    FILTER_PARAMS = {
+        "median": ("size", 1, 15, 1, 0),
+        "iir": ("alpha", 0.001, 1.0, 0.05, 3),
+        "slope": ("max_step", 1, 4095, 8, 0)
+    }
 
     DROP_H_POLICY = QtWidgets.QSizePolicy.Policy.Expanding
     DROP_V_POLICY = QtWidgets.QSizePolicy.Policy.Preferred
@@ -92,6 +108,9 @@ class ProfileWidget(QtWidgets.QWidget):
     SAVE_CLICKED = QtCore.Signal()
     DROPDOWN_ACTIVATED = QtCore.Signal(str)
     KEYS_CLICKED = QtCore.Signal()
+    IMPORT_CLICKED = QtCore.Signal()
+    EXPORT_CLICKED = QtCore.Signal()
+    FILTER_CHANGED = QtCore.Signal()
 
     def __init__(self):
         super(ProfileWidget, self).__init__()
@@ -102,10 +121,19 @@ class ProfileWidget(QtWidgets.QWidget):
         self._remove = self._create_tool_button(self.REMOVE_ICON)
         self._rename = self._create_tool_button(self.RENAME_ICON)
         self._keys = self._create_tool_button(self.KEYS_ICON)
+        self._import = self._create_tool_button(self.IMPORT_ICON)
+        self._export = self._create_tool_button(self.EXPORT_ICON)
 
         self._dropdown = QtWidgets.QComboBox()
         self._dropdown.setSizePolicy(self.DROP_H_POLICY, self.DROP_V_POLICY)
 
+        self._filter_label = QtWidgets.QLabel(self.FILTER_LABEL_STR)
+        self._filter = QtWidgets.QComboBox()
+        self._filter.addItems(list(FILTERS))
+        self._filter_param = QtWidgets.QDoubleSpinBox()
+        self._filter_param.setKeyboardTracking(False)
+        self._set_filter_param(SensorFilter.NAME, {})
+
         layout = QtWidgets.QHBoxLayout()
         layout.addWidget(self._label)
         layout.addWidget(self._dropdown)
@@ -114,6 +142,11 @@ class ProfileWidget(QtWidgets.QWidget):
         layout.addWidget(self._save)
         layout.addWidget(self._remove)
         layout.addWidget(self._keys)
+        layout.addWidget(self._import)
+        layout.addWidget(self._export)
+        layout.addWidget(self._filter_label)
+        layout.addWidget(self._filter)
+        layout.addWidget(self._filter_param)
         layout.setContentsMargins(*self.LAYOUT_PADDING)
         self.setLayout(layout)
 
@@ -123,6 +156,10 @@ class ProfileWidget(QtWidgets.QWidget):
         self._rename.clicked.connect(self.RENAME_CLICKED.emit)
         self._dropdown.activated.connect(self.DROPDOWN_ACTIVATED.emit)
         self._keys.clicked.connect(self.KEYS_CLICKED.emit)
+        self._import.clicked.connect(self.IMPORT_CLICKED.emit)
+        self._export.clicked.connect(self.EXPORT_CLICKED.emit)
+        self._filter.activated.connect(self._filter_activated)
+        self._filter_param.valueChanged.connect(self._filter_param_changed)
 
     def _create_tool_button(
         self, icon: QtWidgets.QStyle.StandardPixmap
@@ -181,3 +218,65 @@ class ProfileWidget(QtWidgets.QWidget):
 
     def set_new_button(self, active: bool) -> None:
         self._new.setEnabled(active)
+
+    def set_library_buttons(self, active: bool) -> None:
+        self._import.setEnabled(active)
+        self._export.setEnabled(active)
+
+    def get_import_path(self) -> str:
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, self.IMPORT_STR, "", self.LIBRARY_FILTER
+        )
+        return path
+
+    def get_export_path(self) -> str:
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, self.EXPORT_STR, self.EXPORT_FILE, self.LIBRARY_FILTER
+        )
+        return path
+
+    def show_transfer_error(self, message: str) -> None:
+        QtWidgets.QMessageBox.warning(self, self.TRANSFER_ERROR_TITLE, message)
+
+    def _filter_activated(self, index: int) -> None:
+        name = self._filter.itemText(index)
+        self._set_filter_param(name, FILTERS[name]().params)
+        self.FILTER_CHANGED.emit()
+
+    def _filter_param_changed(self, value: float) -> None:
+        self.FILTER_CHANGED.emit()
+
+    def _set_filter_param(self, name: str, config: dict) -> None:
+        param = self.FILTER_PARAMS.get(name)
+        self._filter_param.setEnabled(
+            param is not None and self._filter.isEnabled()
+        )
+        if param is None:
+            return
+        key, low, high, step, decimals = param
+        self._filter_param.blockSignals(True)
+        self._filter_param.setDecimals(decimals)
+        self._filter_param.setRange(low, high)
+        self._filter_param.setSingleStep(step)
+        self._filter_param.setValue(config[key])
+        self._filter_param.blockSignals(False)
+
+    def set_filter_state(self, active: bool) -> None:
+        self._filter.setEnabled(active)
+        name = self._filter.currentText()
+        self._filter_param.setEnabled(
+            active and name in self.FILTER_PARAMS
+        )
+
+    def set_filter_config(self, config: dict) -> None:
+        name = config.get("type", SensorFilter.NAME)
+        self._filter.setCurrentText(name)
+        self._set_filter_param(name, config)
+
+    def get_filter_config(self) -> tuple[dict, str]:
+        name = self._filter.currentText()
+        config = {"type": name}
+        if (param := self.FILTER_PARAMS.get(name)) is not None:
+            value = self._filter_param.value()
+            config[param[0]] = value if param[4] else int(value)
+        return (config, self.get_pad_name())
@@ -1,9 +1,14 @@
 import asyncio
+import copy
 import cProfile
+import dataclasses
+import json
 import sys
 import threading
 import time
 
+import numpy as np
+
 
 class Profiler:
     def __init__(self, timeout: int, fn: str):
@@ -56,3 +61,192 @@ class DeltaTimer:
             self._delta += current_time - self._last_time - self._expected
             self._last_time = current_time
             print(f"{self._method}: {self._delta:8.5f} @ {self._samples}S")
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond latencies in the HDR style."""
+
+    SUB_BUCKET_BITS = 7
+    MAX_EXPONENT = 40
+
+    def __init__(self):
+        self._half = 1 << (self.SUB_BUCKET_BITS - 1)
+        num_buckets = (self.MAX_EXPONENT - self.SUB_BUCKET_BITS + 2)
+        self._counts = np.zeros(num_buckets * self._half, np.int64)
+        self._total = 0
+        self._max = 0
+
+    def bucket_index(self, values: np.ndarray) -> np.ndarray:
+        limit = (1 << self.MAX_EXPONENT) - 1
+        values = np.clip(values, 0, limit).astype(np.int64)
+        _, exponents = np.frexp(values)
+        shifts = np.maximum(exponents - self.SUB_BUCKET_BITS, 0)
+        return shifts * self._half + (values >> shifts)
+
+    def bucket_value(self, index: int) -> int:
+        shift = max(index // self._half - 1, 0)
+        return (index - shift * self._half) << shift
+
+    def record(self, values: np.ndarray | int) -> None:
+        values = np.atleast_1d(values)
+        if len(values) == 0:
+            return
+        np.add.at(self._counts, self.bucket_index(values), 1)
+        self._total += len(values)
+        self._max = max(self._max, int(values.max()))
+
+    def percentile(self, percent: float) -> int:
+        if self._total == 0:
+            return 0
+        target = max(1, int(np.ceil(percent / 100.0 * self._total)))
+        index = int(np.searchsorted(np.cumsum(self._counts), target))
+        return min(self.bucket_value(index + 1) - 1, self._max)
+
+    def buckets(self) -> list[tuple[int, int]]:
+        indices = np.flatnonzero(self._counts)
+        return [
+            (self.bucket_value(index), int(self._counts[index]))
+            for index in indices.tolist()
+        ]
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self._counts += other._counts
+        self._total += other._total
+        self._max = max(self._max, other._max)
+
+    def reset(self) -> None:
+        self._counts[:] = 0
+        self._total = 0
+        self._max = 0
+
+    @property
+    def count(self) -> int:
+        return self._total
+
+    @property
+    def max(self) -> int:
+        return self._max
+
+
+@dataclasses.dataclass
+class SampleStamps:
+    """Monotonic nanosecond stage timestamps for a block of samples."""
+
+    read: np.ndarray
+    handoff: int = 0
+    decoded: int = 0
+    activated: int = 0
+    queued: int = 0
+
+
+class LatencyRecorder:
+    """Per-stage latency histograms from USB report to key event."""
+
+    STAGES = [
+        "handoff", "decode", "activation", "key_queue", "key_emit", "total",
+        "light"
+    ]
+    UNITS = {
+        "handoff": "report",
+        "decode": "block",
+        "activation": "block",
+        "key_queue": "block",
+        "key_emit": "key",
+        "total": "key",
+        "light": "press"
+    }
+    PERCENTILES = [50.0, 90.0, 99.0, 99.9]
+
+    def __init__(self):
+        self.backend = ""
+        self._lock = threading.Lock()
+        self._histograms = {
+            stage: LatencyHistogram() for stage in self.STAGES
+        }
+
+    def __getstate__(self) -> dict:
+        return {"backend": self.backend, "histograms": self.histograms()}
+
+    def __setstate__(self, state: dict) -> None:
+        self.backend = state["backend"]
+        self._lock = threading.Lock()
+        self._histograms = state["histograms"]
+
+    def histograms(self) -> dict[str, LatencyHistogram]:
+        with self._lock:
+            return copy.deepcopy(self._histograms)
+
+    def merge(self, other: "LatencyRecorder") -> None:
+        histograms = other.histograms()
+        with self._lock:
+            self.backend = self.backend or other.backend
+            for stage, histogram in histograms.items():
+                self._histograms[stage].merge(histogram)
+
+    def record(self, stage: str, values: np.ndarray | int) -> None:
+        with self._lock:
+            self._histograms[stage].record(values)
+
+    def record_stamps(self, stamps: SampleStamps, rows: np.ndarray) -> None:
+        if len(stamps.read) == 0:
+            return
+        self.record("handoff", stamps.handoff - stamps.read.astype(np.int64))
+        self.record("decode", stamps.decoded - stamps.handoff)
+        self.record("activation", stamps.activated - stamps.decoded)
+        if len(rows) == 0:
+            return
+        self.record("key_queue", stamps.queued - stamps.activated)
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        return self.summarise(self.histograms())
+
+    @classmethod
+    def summarise(
+        cls, histograms: dict[str, LatencyHistogram]
+    ) -> dict[str, dict[str, int]]:
+        summary = {}
+        for stage, histogram in histograms.items():
+            stats = {"count": histogram.count, "max": histogram.max}
+            for percent in cls.PERCENTILES:
+                stats[f"p{percent:g}"] = histogram.percentile(percent)
+            summary[stage] = stats
+        return summary
+
+    def report(self) -> str:
+        columns = [f"p{percent:g}" for percent in self.PERCENTILES]
+        columns.append("max")
+        lines = [
+            f"key output: {self.backend}",
+            f"{'stage (us)':<12}{'count':>9}{'per':>8}" +
+            "".join(f"{column:>9}" for column in columns)
+        ]
+        for stage, stats in self.summary().items():
+            values = "".join(
+                f"{stats[column] / 1000.0:>9.1f}" for column in columns
+            )
+            lines.append(
+                f"{stage:<12}{stats['count']:>9}{self.UNITS[stage]:>8}"
+                f"{values}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        histograms = self.histograms()
+        data = {
+            "backend": self.backend,
+            "stages": {
+                stage: {
+                    "unit": self.UNITS[stage],
+                    "summary_ns": stats,
+                    "buckets_ns": histograms[stage].buckets()
+                }
+                for stage, stats in self.summarise(histograms).items()
+            }
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def reset(self) -> None:
+        with self._lock:
+            for histogram in self._histograms.values():
+                histogram.reset()
@@ -1,6 +1,12 @@
-from led_data_handler import LEDDataHandler
-from pad_model import Coord, PadModel
-from sensor_data_handler import SensorDataHandler
+import multiprocessing
+from multiprocessing.synchronize import Event
+
+import numpy as np
+
+from pad_model import PadModel, SensorCoord
+from pad_snapshot import PadSnapshot
+from pad_worker import PadSettings, PadWorkerProcess
+from profiler import LatencyRecorder
 from usb_controller import USBDeviceList, HIDReadProcess, HIDWriteProcess
 from usb_info import ReflexV2Info
 
@@ -8,30 +14,69 @@ from usb_info import ReflexV2Info
 class ReflexPadInstance:
     """API to a connected RE:Flex v2 dance pad."""
 
-    def __init__(self, info: ReflexV2Info, serial: str, model: PadModel):
+    FRAME_FIELDS = ["base", "current", "active", "leds"]
+
+    def __init__(
+        self, info: ReflexV2Info, serial: str, model: PadModel, notify: Event
+    ):
         self._serial = serial
-        self._read = HIDReadProcess(info, serial)
-        self._write = HIDWriteProcess(info, serial)
-        self._sensors = SensorDataHandler(
-            self._read.data, self._read.event
-        )
-        self._lights = LEDDataHandler(
-            self._write.data, self._write.event, model
+        self._model = model
+        self._profile = None
+        self._settings = self.settings()
+        self._generation = 0
+        self._wake = multiprocessing.Event()
+        self._read = HIDReadProcess(info, serial, self._wake)
+        self._write = HIDWriteProcess(info, serial, self._wake)
+        self._worker = PadWorkerProcess(
+            self._read.ring, self._write.data, self._write.event,
+            self._settings, self._wake, notify
         )
 
     def disconnect(self) -> None:
+        self._worker.close()
         self._read.terminate()
         self._write.terminate()
 
-    def handle_sensor_data(self) -> None:
-        self._sensors.take_sample()
+    def settings(self) -> PadSettings:
+        entry = self._model.get_model_data()
+        return (entry.profile_data, self._model.filter_config)
+
+    def push_settings(self) -> None:
+        settings = self.settings()
+        if settings != self._settings:
+            self._settings = settings
+            self._worker.send_settings(settings)
+
+    def handle_pad_data(self) -> None:
+        snapshot = self._worker.snapshot
+        if snapshot.generation == self._generation:
+            return
+        self._generation = snapshot.generation
+        fields = snapshot.read()
+        entry = self._model.get_model_data()
+        for name in self.FRAME_FIELDS:
+            np.copyto(getattr(entry, name), fields[name])
+
+    def collect_latency(
+        self, timeout: float
+    ) -> tuple[LatencyRecorder, int] | None:
+        return self._worker.request_latency(timeout)
 
-    def handle_light_data(self) -> None:
-        self._lights.give_sample()
+    @property
+    def key_error(self) -> str:
+        return self._worker.key_error
 
     @property
-    def pad_data(self) -> dict[tuple[Coord, Coord], int]:
-        return self._sensors.pad_data
+    def model(self) -> PadModel:
+        return self._model
+
+    @property
+    def profile(self) -> str | None:
+        return self._profile
+
+    @profile.setter
+    def profile(self, name: str | None) -> None:
+        self._profile = name
 
     @property
     def serial(self) -> str:
@@ -43,42 +88,167 @@ class ReflexController:
 
     CONNECTED = True
     DISCONNECTED = False
+    LATENCY_TIMEOUT_SECS = 1.0
 
-    def __init__(self, model: PadModel):
+    def __init__(self):
         self._info = ReflexV2Info()
-        self._instance = None
+        self._instances: dict[str, ReflexPadInstance] = {}
+        self._selected = None
         self._serials = []
-        self._model = model
+        self._notify = multiprocessing.Event()
+        self._default_model = PadModel()
+        self._default_profile = None
+        self._snapshot = None
+        self._frame_requested = False
         self.enumerate_pads()
 
     def enumerate_pads(self) -> None:
         self._serials = USBDeviceList.connected_device_names(self._info)
 
     def toggle_pad_connection(self, serial: str) -> bool:
-        if self._instance:
-            return self.disconnect_pad()
+        if serial in self._instances:
+            return self.disconnect_pad(serial)
         else:
             return self.connect_pad(serial)
 
     def connect_pad(self, serial: str) -> bool:
-        if pad := ReflexPadInstance(self._info, serial, self._model):
-            if self._instance is None and serial in self._serials:
-                self._instance = pad
-                return self.CONNECTED
+        if serial in self._instances or serial not in self._serials:
+            return self.DISCONNECTED
+        model = PadModel()
+        model.profile_data = self.model.profile_data
+        model.filter_config = self.model.filter_config
+        if self._instances and (keys := self.free_keys()) is not None:
+            model.keys_updated(keys)
+        pad = ReflexPadInstance(self._info, serial, model, self._notify)
+        pad.profile = self.profile
+        self._instances[serial] = pad
+        self._selected = serial
+        return self.CONNECTED
+
+    def disconnect_pad(self, serial: str | None = None) -> bool:
+        serials = list(self._instances) if serial is None else [serial]
+        for serial in serials:
+            if (pad := self._instances.pop(serial, None)) is None:
+                continue
+            pad.disconnect()
+            if self._selected == serial:
+                self._default_model.profile_data = pad.model.profile_data
+                self._default_model.filter_config = pad.model.filter_config
+                self._default_profile = pad.profile
+                self._selected = next(iter(self._instances), None)
         return self.DISCONNECTED
 
-    def disconnect_pad(self) -> bool:
-        if self._instance is None:
+    def free_keys(self) -> list[str] | None:
+        used = {
+            panel.key
+            for pad in self._instances.values()
+            for panel in pad.model.get_model_data().panel_list
+        }
+        for keys in PadModel.KEY_SETS:
+            if used.isdisjoint(keys):
+                return keys
+        return None
+
+    def select_pad(self, serial: str) -> bool:
+        if serial not in self._instances:
             return self.DISCONNECTED
-        self._instance.disconnect()
-        self._instance = None
-        return self.DISCONNECTED
+        self._selected = serial
+        self._instances[serial].handle_pad_data()
+        return self.CONNECTED
+
+    def handle_pad_data(self) -> bool:
+        if pad := self.pad:
+            pad.handle_pad_data()
+        return len(self._instances) > 0
+
+    def push_settings(self) -> None:
+        for pad in self._instances.values():
+            pad.push_settings()
 
     def get_all_pads(self) -> list[str | None]:
         return self._serials
 
+    def get_key_error(self, *_) -> str | None:
+        if (pad := self.pad) and pad.key_error:
+            return pad.key_error
+        return None
+
+    def collect_latency(self) -> tuple[LatencyRecorder, int]:
+        latency = LatencyRecorder()
+        lost = 0
+        for pad in list(self._instances.values()):
+            reply = pad.collect_latency(self.LATENCY_TIMEOUT_SECS)
+            if reply is not None:
+                latency.merge(reply[0])
+                lost += reply[1]
+        return latency, lost
+
+    def report_latency(self, path: str = "") -> str:
+        latency, lost = self.collect_latency()
+        if path:
+            latency.dump(path)
+        report = latency.report()
+        return (
+            f"{report}\nlost reports: {lost}\n"
+            f"filter: {self.model.sensor_filter.describe()}"
+        )
+
+    def publish_model_data(self) -> bool | None:
+        self._frame_requested = True
+        return self.publish_requested_frame()
+
+    def publish_requested_frame(self) -> bool | None:
+        if self._snapshot is None or not self._frame_requested:
+            return None
+        updated = self._snapshot.publish(self.model.get_model_data())
+        if updated is not None:
+            self._frame_requested = False
+        return updated
+
+    def set_default(self) -> None:
+        self.model.set_default()
+
+    def set_sensor(self, data: tuple[int, int, SensorCoord]) -> bool:
+        return self.model.set_sensor(data)
+
+    def view_updated(self) -> None:
+        self.model.view_updated()
+
     @property
     def pad(self) -> ReflexPadInstance | None:
-        if self._instance:
-            return self._instance
-        return None
+        return self._instances.get(self._selected)
+
+    @property
+    def snapshot(self) -> PadSnapshot | None:
+        return self._snapshot
+
+    @snapshot.setter
+    def snapshot(self, snapshot: PadSnapshot) -> None:
+        self._snapshot = snapshot
+
+    @property
+    def notify(self) -> Event:
+        return self._notify
+
+    @property
+    def pads(self) -> dict[str, ReflexPadInstance]:
+        return self._instances
+
+    @property
+    def model(self) -> PadModel:
+        if pad := self.pad:
+            return pad.model
+        return self._default_model
+
+    @property
+    def profile(self) -> str | None:
+        if pad := self.pad:
+            return pad.profile
+        return self._default_profile
+
+    @profile.setter
+    def profile(self, name: str | None) -> None:
+        if pad := self.pad:
+            pad.profile = name
+        else:
+            self._default_profile = name
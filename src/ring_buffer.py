@@ -0,0 +1,96 @@
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class ReportRingBuffer:
+    """Single-producer shared memory ring of raw HID reports."""
+
+    SLOTS = 256
+    HEADER_BYTES = 8
+
+    def __init__(self, report_bytes: int, slots: int = SLOTS):
+        self._report_bytes = report_bytes
+        self._slots = slots
+        size = self.HEADER_BYTES + slots * (16 + report_bytes)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._owner = True
+        self._cursor = 0
+        self._lost = 0
+        self._attach()
+        self._head[0] = 0
+        self._seq[:] = 0
+
+    def __getstate__(self) -> dict:
+        return {
+            "name": self._shm.name,
+            "report_bytes": self._report_bytes,
+            "slots": self._slots
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self._report_bytes = state["report_bytes"]
+        self._slots = state["slots"]
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._owner = False
+        self._cursor = 0
+        self._lost = 0
+        self._attach()
+
+    def _attach(self) -> None:
+        buf = self._shm.buf
+        slots = self._slots
+        offset = self.HEADER_BYTES
+        self._head = np.ndarray((1,), np.uint64, buf, 0)
+        self._seq = np.ndarray((slots,), np.uint64, buf, offset)
+        offset += slots * 8
+        self._stamps = np.ndarray((slots,), np.uint64, buf, offset)
+        offset += slots * 8
+        shape = (slots, self._report_bytes)
+        self._reports = np.ndarray(shape, np.uint8, buf, offset)
+
+    def write(self, report: bytes) -> int:
+        head = int(self._head[0])
+        slot = head % self._slots
+        self._seq[slot] = 0
+        data = np.frombuffer(report, np.uint8)
+        self._reports[slot, :len(data)] = data
+        stamp = time.monotonic_ns()
+        self._stamps[slot] = stamp
+        self._seq[slot] = head + 1
+        self._head[0] = head + 1
+        return stamp
+
+    def read(self) -> tuple[np.ndarray, np.ndarray]:
+        head = int(self._head[0])
+        start = max(self._cursor, head - self._slots)
+        self._lost += start - self._cursor
+        self._cursor = head
+        if start == head:
+            return self._reports[0:0], self._stamps[0:0]
+        index = np.arange(start, head)
+        before = np.take(self._seq, index, mode='wrap')
+        reports = np.take(self._reports, index, axis=0, mode='wrap')
+        stamps = np.take(self._stamps, index, mode='wrap')
+        after = np.take(self._seq, index, mode='wrap')
+        expected = index.astype(np.uint64) + 1
+        valid = (before == expected) & (after == expected)
+        if not valid.all():
+            self._lost += len(valid) - int(np.count_nonzero(valid))
+            return reports[valid], stamps[valid]
+        return reports, stamps
+
+    def close(self) -> None:
+        del self._head, self._seq, self._stamps, self._reports
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    @property
+    def lost(self) -> int:
+        return self._lost
+
+    @property
+    def available(self) -> int:
+        return int(self._head[0]) - self._cursor
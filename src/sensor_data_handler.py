@@ -1,39 +1,75 @@
-from multiprocessing.sharedctypes import SynchronizedArray
-from multiprocessing.synchronize import Event
+import time
+
+import numpy as np
 
 from pad_model import Coord, PadModel
+from profiler import SampleStamps
+from ring_buffer import ReportRingBuffer
 
 
 class SensorDataHandler:
     """Converts sensors data from RE:Flex Dance to PadModel format."""
 
-    def __init__(self, data: SynchronizedArray, event: Event):
-        self._data = data
-        self._event = event
+    NUM_SENSORS = 16
+
+    def __init__(self, ring: ReportRingBuffer):
+        self._ring = ring
         self._refreshed = False
         self._initialised = False
-        self._pad_data = {}
+        self._samples = np.zeros((0, self.NUM_SENSORS), np.uint16)
+        self._sample = np.zeros(self.NUM_SENSORS, np.uint16)
+        self._stamps = SampleStamps(np.zeros(0, np.uint64))
 
     def take_sample(self) -> None:
-        if not self._event.is_set():
+        handoff = time.monotonic_ns()
+        reports, timestamps = self._ring.read()
+        self._samples = self.organise_sensor_data(reports)
+        self._stamps = SampleStamps(
+            timestamps, handoff, time.monotonic_ns()
+        )
+        if len(self._samples) == 0:
             return
-        with self._data.get_lock():
-            self.organise_sensor_data(self._data)
+        self._sample = self._samples[-1]
         if not self._initialised:
             self._initialised = True
             self._refreshed = True
-        self._event.clear()
 
-    def organise_sensor_data(self, sensor_data: SynchronizedArray) -> None:
-        for index in range(0, len(sensor_data) // 2, 2):
-            panel_coord = PadModel.PANELS.coords[(index // 2) // 4]
-            sensor_coord = PadModel.SENSORS.coords[(index // 2) % 4]
-            sensor_value = sensor_data[index] + (sensor_data[index + 1] << 8)
-            self._pad_data[(panel_coord, sensor_coord)] = sensor_value
+    @staticmethod
+    def organise_sensor_data(reports: np.ndarray) -> np.ndarray:
+        low = reports[:, 0:32:2].astype(np.uint16)
+        high = reports[:, 1:32:2].astype(np.uint16)
+        return low | (high << 8)
+
+    @staticmethod
+    def sample_to_pad_data(
+        sample: np.ndarray
+    ) -> dict[tuple[Coord, Coord], int]:
+        pad_data = {}
+        for index, sensor_value in enumerate(sample.tolist()):
+            panel_coord = PadModel.PANELS.coords[index // 4]
+            sensor_coord = PadModel.SENSORS.coords[index % 4]
+            pad_data[(panel_coord, sensor_coord)] = sensor_value
+        return pad_data
 
     @property
     def pad_data(self) -> dict[tuple[Coord, Coord], int]:
-        return self._pad_data.copy()
+        return self.sample_to_pad_data(self._sample)
+
+    @property
+    def sample(self) -> np.ndarray:
+        return self._sample
+
+    @property
+    def samples(self) -> np.ndarray:
+        return self._samples
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._stamps.read
+
+    @property
+    def stamps(self) -> SampleStamps:
+        return self._stamps
 
     @property
     def refreshed(self) -> bool:
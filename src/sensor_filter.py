@@ -0,0 +1,171 @@
+import numpy as np
+
+
+class SensorFilter:
+    """Base class for streaming filters applied to blocks of sensor samples."""
+
+    NAME = "none"
+
+    @classmethod
+    def create(cls, config: dict | None = None) -> "SensorFilter":
+        config = dict(config or {})
+        name = config.pop("type", cls.NAME)
+        if name not in FILTERS:
+            raise ValueError(f"Unknown sensor filter {name}.")
+        return FILTERS[name](**config)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        return samples
+
+    def reset(self) -> None:
+        pass
+
+    def describe(self) -> str:
+        params = ", ".join(f"{k}={v}" for k, v in self.params.items())
+        return (
+            f"{self.NAME}({params}), "
+            f"group delay {self.group_delay:.1f} reports"
+        )
+
+    @property
+    def params(self) -> dict:
+        return {}
+
+    @property
+    def config(self) -> dict:
+        return {"type": self.NAME, **self.params}
+
+    @property
+    def group_delay(self) -> float:
+        return 0.0
+
+
+class MedianFilter(SensorFilter):
+    """Running median over the last N reports of each sensor."""
+
+    NAME = "median"
+
+    def __init__(self, size: int = 3):
+        self._size = max(int(size), 1)
+        self._history: np.ndarray | None = None
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if self._size == 1 or len(samples) == 0:
+            return samples
+        if self._history is None:
+            self._history = np.repeat(samples[:1], self._size - 1, axis=0)
+        window = np.concatenate((self._history, samples))
+        self._history = window[1 - self._size:].copy()
+        views = np.lib.stride_tricks.sliding_window_view(
+            window, self._size, axis=0
+        )
+        middle = self._size // 2
+        if self._size % 2:
+            return np.partition(views, middle, axis=-1)[..., middle]
+        ranked = np.partition(views, (middle - 1, middle), axis=-1)
+        pairs = ranked[..., middle - 1:middle + 1].astype(np.int32)
+        return np.rint(pairs.mean(axis=-1)).astype(samples.dtype)
+
+    def reset(self) -> None:
+        self._history = None
+
+    @property
+    def params(self) -> dict:
+        return {"size": self._size}
+
+    @property
+    def group_delay(self) -> float:
+        return (self._size - 1) / 2
+
+
+class OnePoleFilter(SensorFilter):
+    """First order IIR low pass, y += alpha * (x - y), per sensor."""
+
+    NAME = "iir"
+    CHUNK = 32
+    MIN_ALPHA = 0.001
+
+    def __init__(self, alpha: float = 0.5):
+        self._alpha = min(max(float(alpha), self.MIN_ALPHA), 1.0)
+        self._state: np.ndarray | None = None
+        if self._alpha < 1.0:
+            powers = (1.0 - self._alpha) ** np.arange(1, self.CHUNK + 1)
+            self._decay = powers
+            self._gain = self._alpha / powers
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if self._alpha >= 1.0 or len(samples) == 0:
+            return samples
+        values = samples.astype(np.float64)
+        if self._state is None:
+            self._state = values[0].copy()
+        shape = (-1,) + (1,) * (values.ndim - 1)
+        for first in range(0, len(values), self.CHUNK):
+            chunk = values[first:first + self.CHUNK]
+            count = len(chunk)
+            chunk *= self._gain[:count].reshape(shape)
+            np.cumsum(chunk, axis=0, out=chunk)
+            chunk += self._state
+            chunk *= self._decay[:count].reshape(shape)
+            self._state = chunk[-1].copy()
+        return np.rint(values)
+
+    def reset(self) -> None:
+        self._state = None
+
+    @property
+    def params(self) -> dict:
+        return {"alpha": self._alpha}
+
+    @property
+    def group_delay(self) -> float:
+        return (1.0 - self._alpha) / self._alpha
+
+
+class SlopeLimitFilter(SensorFilter):
+    """Limits how far each sensor may move between consecutive reports."""
+
+    NAME = "slope"
+
+    def __init__(self, max_step: int = 64):
+        self._max_step = max(int(max_step), 1)
+        self._state: np.ndarray | None = None
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if len(samples) == 0:
+            return samples
+        values = samples.astype(np.int32)
+        if self._state is None:
+            self._state = values[0].copy()
+        steps = np.diff(values, axis=0, prepend=self._state[None])
+        limited = np.abs(steps) > self._max_step
+        if not limited.any():
+            self._state = values[-1].copy()
+            return values
+        first = int(np.argmax(limited.reshape(len(values), -1).any(axis=1)))
+        state = values[first - 1] if first else self._state
+        step = np.full_like(state, self._max_step)
+        limit = np.empty_like(state)
+        for row in values[first:]:
+            np.subtract(state, step, limit)
+            np.maximum(row, limit, out=row)
+            np.add(state, step, limit)
+            np.minimum(row, limit, out=row)
+            state = row
+        self._state = state.copy()
+        return values
+
+    def reset(self) -> None:
+        self._state = None
+
+    @property
+    def params(self) -> dict:
+        return {"max_step": self._max_step}
+
+
+FILTERS: dict[str, type[SensorFilter]] = {
+    SensorFilter.NAME: SensorFilter,
+    MedianFilter.NAME: MedianFilter,
+    OnePoleFilter.NAME: OnePoleFilter,
+    SlopeLimitFilter.NAME: SlopeLimitFilter
+}
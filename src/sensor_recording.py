@@ -0,0 +1,216 @@
+import array
+import os
+import struct
+import time
+
+import numpy as np
+
+from pad_model import Edges, PadModel
+from ring_buffer import ReportRingBuffer
+from sensor_data_handler import SensorDataHandler
+from usb_backend import USBBackend
+from usb_info import HIDInfo, ReflexV2Info
+
+
+class SensorRecorder:
+    """Append-only binary log of raw HID reports and their timestamps."""
+
+    MAGIC = b"RFXREC01"
+    HEADER_FORMAT = "<8sII32s"
+    HEADER_BYTES = struct.calcsize(HEADER_FORMAT)
+    VERSION = 1
+    EXTENSION = ".rfxrec"
+    FLUSH_SECS = 0.5
+
+    @classmethod
+    def record_dtype(cls, report_bytes: int) -> np.dtype:
+        return np.dtype(
+            [("stamp", "<u8"), ("report", "u1", (report_bytes,))]
+        )
+
+    @classmethod
+    def create(
+        cls, directory: str, serial: str, report_bytes: int
+    ) -> "SensorRecorder":
+        os.makedirs(directory, exist_ok=True)
+        name = f"{serial}-{time.strftime('%Y%m%d-%H%M%S')}{cls.EXTENSION}"
+        return cls(os.path.join(directory, name), serial, report_bytes)
+
+    def __init__(self, path: str, serial: str, report_bytes: int):
+        self._report_bytes = report_bytes
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(struct.pack(
+                self.HEADER_FORMAT, self.MAGIC, self.VERSION, report_bytes,
+                serial.encode()
+            ))
+        self._flushed = time.monotonic()
+
+    def write(self, stamp: int, report: bytes) -> None:
+        self._file.write(struct.pack("<Q", stamp) + bytes(report))
+        now = time.monotonic()
+        if now - self._flushed >= self.FLUSH_SECS:
+            self._file.flush()
+            self._flushed = now
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SensorRecording:
+    """Memory-mapped reader for a SensorRecorder log."""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            header = f.read(SensorRecorder.HEADER_BYTES)
+        if len(header) < SensorRecorder.HEADER_BYTES:
+            raise ValueError(f"{path} is not a sensor recording.")
+        magic, version, report_bytes, serial = struct.unpack(
+            SensorRecorder.HEADER_FORMAT, header
+        )
+        if magic != SensorRecorder.MAGIC:
+            raise ValueError(f"{path} is not a sensor recording.")
+        if version != SensorRecorder.VERSION:
+            raise ValueError(f"{path} has unsupported version {version}.")
+        self._serial = serial.rstrip(b"\0").decode()
+        dtype = SensorRecorder.record_dtype(report_bytes)
+        data_bytes = os.path.getsize(path) - SensorRecorder.HEADER_BYTES
+        count = data_bytes // dtype.itemsize
+        if count == 0:
+            self._records = np.zeros(0, dtype)
+        else:
+            self._records = np.memmap(
+                path, dtype, 'r', SensorRecorder.HEADER_BYTES, (count,)
+            )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def serial(self) -> str:
+        return self._serial
+
+    @property
+    def stamps(self) -> np.ndarray:
+        return self._records["stamp"]
+
+    @property
+    def reports(self) -> np.ndarray:
+        return self._records["report"]
+
+
+class SensorReplay:
+    """Feeds a sensor recording through SensorDataHandler and PadModel."""
+
+    def __init__(
+        self, recording: SensorRecording, model: PadModel,
+        speed: float = 0.0, block: int = 1
+    ):
+        self._recording = recording
+        self._model = model
+        self._speed = speed
+        self._block = block
+        report_bytes = recording.reports.shape[1]
+        self._ring = ReportRingBuffer(report_bytes, max(block, 1) * 2)
+        self._sensors = SensorDataHandler(self._ring)
+
+    def run(self) -> Edges:
+        stamps = self._recording.stamps
+        reports = self._recording.reports
+        edges = []
+        start = time.perf_counter()
+        for first in range(0, len(reports), self._block):
+            last = min(first + self._block, len(reports))
+            if self._speed > 0:
+                offset = int(stamps[last - 1]) - int(stamps[0])
+                due = start + offset / 1e9 / self._speed
+                if (wait := due - time.perf_counter()) > 0:
+                    time.sleep(wait)
+            for report in reports[first:last]:
+                self._ring.write(report)
+            self._sensors.take_sample()
+            if self._sensors.refreshed:
+                self._model.set_baseline_values(self._sensors.sample)
+                continue
+            rows, panels, pressed = self._model.activate(
+                self._sensors.samples
+            )
+            self._model.emit_keys((rows, panels, pressed))
+            edges.append((rows + first, panels, pressed))
+        if not edges:
+            empty = np.zeros(0, np.intp)
+            return empty, empty, np.zeros(0, np.bool_)
+        return tuple(np.concatenate(column) for column in zip(*edges))
+
+    def close(self) -> None:
+        self._ring.close()
+
+
+class ReplayDevice:
+    """Plays a sensor recording back in place of a RE:Flex v2 dance pad."""
+
+    def __init__(
+        self, recording: SensorRecording, info: HIDInfo, speed: float
+    ):
+        if len(recording) == 0:
+            raise ValueError(
+                f"Sensor recording for {recording.serial} is empty."
+            )
+        self.serial_number = recording.serial
+        self._recording = recording
+        self._info = info
+        self._speed = speed
+        self._index = 0
+        self._start = time.perf_counter()
+
+    def read(
+        self, endpoint: int, size: int, timeout: int | None = None
+    ) -> array.array:
+        if endpoint != self._info.READ_EP:
+            raise ValueError(f"Invalid read endpoint {endpoint:#x}.")
+        if self._index >= len(self._recording):
+            self._index = 0
+            self._start = time.perf_counter()
+        if self._speed > 0:
+            stamps = self._recording.stamps
+            offset = int(stamps[self._index]) - int(stamps[0])
+            due = self._start + offset / 1e9 / self._speed
+            if (wait := due - time.perf_counter()) > 0:
+                time.sleep(wait)
+        report = self._recording.reports[self._index]
+        self._index += 1
+        return array.array('B', report.tobytes())
+
+    def write(
+        self, endpoint: int, data: list[int], timeout: int | None = None
+    ) -> int:
+        if endpoint != self._info.WRITE_EP:
+            raise ValueError(f"Invalid write endpoint {endpoint:#x}.")
+        time.sleep(0.001)
+        return len(data)
+
+
+class ReplayBackend(USBBackend):
+    """Backend presenting sensor recordings as connected dance pads."""
+
+    FILES_ENV = "REFLEX_REPLAY_FILES"
+    SPEED_ENV = "REFLEX_REPLAY_SPEED"
+
+    def __init__(
+        self, paths: list[str] | None = None, speed: float | None = None
+    ):
+        if paths is None:
+            paths = os.environ.get(self.FILES_ENV, "").split(os.pathsep)
+        if speed is None:
+            speed = float(os.environ.get(self.SPEED_ENV, "1.0"))
+        self._info = ReflexV2Info()
+        self._paths = [path for path in paths if path]
+        self._speed = speed
+
+    def find(self, vid: int, pid: int) -> list[ReplayDevice]:
+        if (vid, pid) != (self._info.VID, self._info.PID):
+            return []
+        return [
+            ReplayDevice(SensorRecording(path), self._info, self._speed)
+            for path in self._paths
+        ]
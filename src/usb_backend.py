@@ -0,0 +1,24 @@
+import abc
+
+import libusb_package
+import usb.core
+
+
+class USBBackend(abc.ABC):
+    """Base class for locating the devices matching a HID specification."""
+
+    @abc.abstractmethod
+    def find(self, vid: int, pid: int) -> list[usb.core.Device]:
+        pass
+
+
+class LibUSBBackend(USBBackend):
+    """Backend for physical devices connected through libusb."""
+
+    def find(self, vid: int, pid: int) -> list[usb.core.Device]:
+        devices: list[usb.core.Device] | None = libusb_package.find(
+            find_all=True, idVendor=vid, idProduct=pid
+        )
+        if devices is None:
+            return []
+        return list(devices)
@@ -1,36 +1,59 @@
 import multiprocessing
+import os
+import signal
 from multiprocessing.sharedctypes import SynchronizedArray
 from multiprocessing.synchronize import Event
 
-import libusb_package
 import usb.core
-import usb.backend.libusb1
 
+from ring_buffer import ReportRingBuffer
+from sensor_recording import ReplayBackend, SensorRecorder
+from usb_backend import LibUSBBackend, USBBackend
 from usb_info import HIDInfo
+from usb_simulator import SimulatedBackend
 
 
 class USBDeviceList:
     """Device list class for a given dance pad specification."""
 
+    BACKEND_ENV = "REFLEX_USB_BACKEND"
+    BACKENDS = {
+        "libusb": LibUSBBackend,
+        "replay": ReplayBackend,
+        "simulated": SimulatedBackend
+    }
+
+    backend: USBBackend | None = None
+
+    @classmethod
+    def get_backend(cls) -> USBBackend:
+        if cls.backend is None:
+            cls.backend = cls.create_backend(
+                os.environ.get(cls.BACKEND_ENV, "libusb")
+            )
+        return cls.backend
+
+    @classmethod
+    def create_backend(cls, name: str) -> USBBackend:
+        if name not in cls.BACKENDS:
+            valid = ", ".join(cls.BACKENDS)
+            raise ValueError(
+                f"Unknown {cls.BACKEND_ENV} value {name}, "
+                f"expected one of {valid}."
+            )
+        return cls.BACKENDS[name]()
+
     @staticmethod
     def connected_device_names(info: HIDInfo) -> list[str | None]:
-        devs: list[usb.core.Device] = []
-        for dev in libusb_package.find(
-            find_all=True,  idVendor=info.VID, idProduct=info.PID
-        ):
-            devs.append(dev)
+        devs = USBDeviceList.get_backend().find(info.VID, info.PID)
         return [dev.serial_number for dev in devs]
 
     @staticmethod
     def get_device_by_serial(
-        vid: int, pid: int, serial: str
+        vid: int, pid: int, serial: str, backend: USBBackend | None = None
     ) -> usb.core.Device | None:
-        devices: list[usb.core.Device] | None = libusb_package.find(
-            find_all=True, idVendor=vid, idProduct=pid
-        )
-        if devices is None:
-            return
-        for device in devices:
+        backend = backend or USBDeviceList.get_backend()
+        for device in backend.find(vid, pid):
             if device.serial_number == serial:
                 return device
 
@@ -38,12 +61,14 @@ class USBDeviceList:
 class HIDEndpointProcess(multiprocessing.Process):
     """Base class that manages a single HID endpoint in its own process."""
 
-    def __init__(self, pad_info: HIDInfo, serial: str):
+    def __init__(self, pad_info: HIDInfo, serial: str, notify: Event):
         super(HIDEndpointProcess, self).__init__()
+        self._notify = notify
         self._info = pad_info
         self._serial = serial
-        self._data = multiprocessing.Array('i', self._info.BYTES)
+        self._data = multiprocessing.Array('B', self._info.BYTES)
         self._event = multiprocessing.Event()
+        self._backend = USBDeviceList.get_backend()
         self._device = None
         self.start()
 
@@ -52,7 +77,7 @@ class HIDEndpointProcess(multiprocessing.Process):
 
     def run(self) -> None:
         self._device = USBDeviceList.get_device_by_serial(
-            self._info.VID, self._info.PID, self._serial
+            self._info.VID, self._info.PID, self._serial, self._backend
         )
         if self._device is None:
             return
@@ -74,13 +99,47 @@ class HIDEndpointProcess(multiprocessing.Process):
 class HIDReadProcess(HIDEndpointProcess):
     """Child class for reading data from an HID Endpoint."""
 
+    RECORD_ENV = "REFLEX_RECORD_DIR"
+
+    def __init__(self, pad_info: HIDInfo, serial: str, notify: Event):
+        self._ring = ReportRingBuffer(pad_info.BYTES)
+        self._record_dir = os.environ.get(self.RECORD_ENV)
+        self._recorder = None
+        super(HIDReadProcess, self).__init__(pad_info, serial, notify)
+
+    def run(self) -> None:
+        if self._record_dir:
+            self._recorder = SensorRecorder.create(
+                self._record_dir, self._serial, self._info.BYTES
+            )
+            signal.signal(signal.SIGTERM, self._exit)
+        try:
+            super().run()
+        finally:
+            if self._recorder is not None:
+                self._recorder.close()
+
+    @staticmethod
+    def _exit(signum: int, frame) -> None:
+        raise SystemExit(0)
+
+    def terminate(self) -> None:
+        super().terminate()
+        self.join()
+        self._ring.close()
+
     def _process(self) -> None:
         self._device: usb.core.Device
         sensor_data = self._device.read(self._info.READ_EP, self._info.BYTES)
-        with self._data.get_lock():
-            for i, v in enumerate(sensor_data):
-                self._data[i] = v
+        stamp = self._ring.write(sensor_data)
+        if self._recorder is not None:
+            self._recorder.write(stamp, sensor_data)
         self._event.set()
+        self._notify.set()
+
+    @property
+    def ring(self) -> ReportRingBuffer:
+        return self._ring
 
 
 class HIDWriteProcess(HIDEndpointProcess):
@@ -89,6 +148,7 @@ class HIDWriteProcess(HIDEndpointProcess):
     def _process(self) -> None:
         self._device: usb.core.Device
         with self._data.get_lock():
-            data = [d for d in self._data]
+            data = bytes(self._data.get_obj())
+            self._event.set()
+        self._notify.set()
         self._device.write(self._info.WRITE_EP, data)
-        self._event.set()
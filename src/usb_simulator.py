@@ -0,0 +1,161 @@
+import array
+import dataclasses
+import random
+import time
+
+from usb_backend import USBBackend
+from usb_info import HIDInfo, ReflexV2Info
+
+
+@dataclasses.dataclass
+class PressStep:
+    """A panel press within a repeating simulated press pattern."""
+
+    panel: int
+    start: float
+    duration: float
+    force: int = 300
+
+
+class SimulatedReflexV2Device:
+    """Stand-in for a RE:Flex v2 dance pad that needs no USB hardware."""
+
+    NUM_PANELS = 4
+    NUM_SEGMENTS = 4
+    NUM_FRAMES = 16
+    SENSORS_PER_PANEL = 4
+    B12_MAX = 4095
+    BASE_VALUE = 400
+
+    def __init__(
+        self, serial: str, info: HIDInfo, rate: float,
+        pattern: list[PressStep], period: float, noise: float
+    ):
+        self.serial_number = serial
+        self._info = info
+        self._interval = 1.0 / rate
+        self._pattern = pattern
+        self._period = period
+        self._noise = noise
+        self._random = random.Random(serial)
+        self._bases = [
+            self.BASE_VALUE + self._random.randint(-50, 50)
+            for _ in range(self.NUM_PANELS * self.SENSORS_PER_PANEL)
+        ]
+        self._start = time.perf_counter()
+        self._next_read = self._start
+        self._next_write = self._start
+        self._last_frame_byte = None
+        self.reports_read = 0
+        self.reports_written = 0
+        self.reports_repeated = 0
+
+    def _wait(self, due: float) -> float:
+        now = time.perf_counter()
+        if due > now:
+            time.sleep(due - now)
+            return due
+        return now
+
+    def _panel_force(self, elapsed: float) -> list[int]:
+        forces = [0] * self.NUM_PANELS
+        phase = elapsed % self._period
+        for step in self._pattern:
+            if step.start <= phase < step.start + step.duration:
+                forces[step.panel] = max(forces[step.panel], step.force)
+        return forces
+
+    def read(
+        self, endpoint: int, size: int, timeout: int | None = None
+    ) -> array.array:
+        if endpoint != self._info.READ_EP:
+            raise ValueError(f"Invalid read endpoint {endpoint:#x}.")
+        now = self._wait(self._next_read)
+        self._next_read = max(self._next_read + self._interval, now)
+        forces = self._panel_force(now - self._start)
+        report = array.array('B', bytes(size))
+        for index, base in enumerate(self._bases):
+            force = forces[index // self.SENSORS_PER_PANEL]
+            noise = self._random.gauss(0.0, self._noise)
+            value = int(max(0, min(base + force + noise, self.B12_MAX)))
+            report[index * 2] = value & 0xFF
+            report[index * 2 + 1] = value >> 8
+        self.reports_read += 1
+        return report
+
+    def write(
+        self, endpoint: int, data: list[int], timeout: int | None = None
+    ) -> int:
+        if endpoint != self._info.WRITE_EP:
+            raise ValueError(f"Invalid write endpoint {endpoint:#x}.")
+        self.validate_frame(data)
+        now = self._wait(self._next_write)
+        self._next_write = max(self._next_write + self._interval, now)
+        self.reports_written += 1
+        return len(data)
+
+    def validate_frame(self, data: list[int]) -> None:
+        if len(data) != self._info.BYTES:
+            raise ValueError(f"LED report has {len(data)} bytes.")
+        if any(not 0 <= value <= 0xFF for value in data):
+            raise ValueError("LED report contains values outside a byte.")
+        frame_byte = data[0]
+        if frame_byte == self._last_frame_byte:
+            self.reports_repeated += 1
+        elif (expected := self.next_frame_byte()) is not None:
+            if frame_byte != expected:
+                raise ValueError(
+                    f"LED frame byte {frame_byte:#04x}, "
+                    f"expected {expected:#04x}."
+                )
+        self._last_frame_byte = frame_byte
+
+    def next_frame_byte(self) -> int | None:
+        if self._last_frame_byte is None:
+            return None
+        panel = self._last_frame_byte >> 6
+        segment = (self._last_frame_byte >> 4) & 0x03
+        frame = self._last_frame_byte & 0x0F
+        segment = (segment + 1) % self.NUM_SEGMENTS
+        if segment == 0:
+            panel = (panel + 1) % self.NUM_PANELS
+            if panel == 0:
+                frame = (frame + 1) % self.NUM_FRAMES
+        return (panel << 6) | (segment << 4) | frame
+
+
+class SimulatedBackend(USBBackend):
+    """Backend providing simulated RE:Flex v2 dance pads."""
+
+    SERIAL_PREFIX = "SIM"
+    DEFAULT_PATTERN = [
+        PressStep(0, 0.00, 0.10),
+        PressStep(1, 0.25, 0.10),
+        PressStep(2, 0.50, 0.10),
+        PressStep(3, 0.75, 0.10)
+    ]
+
+    def __init__(
+        self, num_pads: int = 1, rate: float = 1000.0,
+        pattern: list[PressStep] | None = None, period: float = 1.0,
+        noise: float = 4.0
+    ):
+        self._info = ReflexV2Info()
+        self._serials = [
+            f"{self.SERIAL_PREFIX}{index:04d}" for index in range(num_pads)
+        ]
+        self._rate = rate
+        self._pattern = self.DEFAULT_PATTERN if pattern is None else pattern
+        self._period = period
+        self._noise = noise
+
+    def find(self, vid: int, pid: int) -> list[SimulatedReflexV2Device]:
+        if (vid, pid) != (self._info.VID, self._info.PID):
+            return []
+        return [
+            SimulatedReflexV2Device(
+                serial, self._info, self._rate, self._pattern,
+                self._period, self._noise
+            )
+            for serial in self._serials
+        ]
@@ -0,0 +1,102 @@
+import numpy as np
+
+from pad_model import (
+    ActivationEngine, BaselineTracker, PadEntry, PadModel, SensorEntry
+)
+
+
+def random_pads(seed: int) -> tuple[PadEntry, PadEntry]:
+    generator = np.random.default_rng(seed)
+    pads = PadModel().get_model_data(), PadModel().get_model_data()
+    shape = pads[0].base.shape
+    base = generator.integers(200, 3800, shape)
+    threshold = generator.integers(2, SensorEntry.MAX_ON + 1, shape)
+    hysteresis = generator.integers(1, threshold + 1)
+    for pad in pads:
+        pad.base[:] = base
+        pad.threshold[:] = threshold
+        pad.hysteresis[:] = hysteresis
+    return pads
+
+
+def scalar_process(
+    pad: PadEntry, samples: np.ndarray
+) -> list[tuple[int, int, bool]]:
+    edges = []
+    for row, values in enumerate(samples):
+        for panel in pad.panel_list:
+            for index, sensor in enumerate(panel.sensors.values()):
+                sensor.set_current_value(int(values[panel.index, index]))
+            if panel.active != panel.pressed:
+                panel.pressed = panel.active
+                edges.append((row, panel.index, panel.active))
+    return edges
+
+
+def test_activation_matches_scalar_path() -> None:
+    generator = np.random.default_rng(0)
+    block_pad, scalar_pad = random_pads(0)
+    shape = block_pad.base.shape
+    for _ in range(200):
+        count = int(generator.integers(0, 33))
+        samples = block_pad.base + generator.integers(
+            -40, 140, (count, *shape)
+        )
+        outliers = generator.random(samples.shape) < 0.01
+        samples[outliers] = generator.choice([-50, 5000], outliers.sum())
+        rows, panels, pressed = ActivationEngine.process(block_pad, samples)
+        edges = list(zip(rows.tolist(), panels.tolist(), pressed.tolist()))
+        assert edges == scalar_process(scalar_pad, samples)
+        np.testing.assert_array_equal(block_pad.current, scalar_pad.current)
+        np.testing.assert_array_equal(block_pad.active, scalar_pad.active)
+        np.testing.assert_array_equal(block_pad.pressed, scalar_pad.pressed)
+
+
+def test_sustained_light_load_is_not_absorbed() -> None:
+    model = PadModel()
+    pad = model.get_model_data()
+    base = np.full(pad.base.shape, 1000)
+    model.set_baseline_values(base)
+    load = SensorEntry.DEFAULT_THRESHOLD - SensorEntry.DEFAULT_HYSTERESIS
+    resting = np.broadcast_to(base + load, (16, *base.shape))
+    for _ in range(3000 // len(resting)):
+        rows, _, _ = model.activate(resting)
+        assert len(rows) == 0
+    assert (pad.base - base).max() <= load // 5
+    press = base + SensorEntry.DEFAULT_THRESHOLD + 5
+    _, panels, pressed = model.activate(press[None])
+    assert sorted(panels[pressed].tolist()) == [0, 1, 2, 3]
+
+
+def test_baseline_matches_per_sample_ema() -> None:
+    generator = np.random.default_rng(1)
+    pad = PadModel().get_model_data()
+    shape = pad.base.shape
+    pad.base[:] = generator.integers(800, 1200, shape)
+    tracker = BaselineTracker(pad.base)
+    alpha = 1.0 / BaselineTracker.TIME_CONSTANT
+    estimate = pad.base.astype(np.float64)
+    expected = pad.base.copy()
+    pending = 0
+    lengths = [1, 7, 64, 255, 256, 300, 700, 1500]
+    for _ in range(60):
+        count = int(generator.choice(lengths))
+        values = generator.integers(900, 1500, (count, *shape))
+        values = values.astype(np.int16)
+        gating = generator.integers(0, 3)
+        if gating == 0:
+            released = np.ones(values.shape, np.bool_)
+        elif gating == 1:
+            released = np.zeros(values.shape, np.bool_)
+        else:
+            released = generator.random(values.shape) < 0.6
+        for row, gate in zip(values, released):
+            estimate = np.where(
+                gate, estimate + alpha * (row - estimate), estimate
+            )
+        tracker.update(pad, values, released)
+        pending += count
+        if pending >= BaselineTracker.UPDATE_SAMPLES:
+            pending = 0
+            expected = np.rint(estimate)
+        np.testing.assert_array_equal(pad.base, expected)
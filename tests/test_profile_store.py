@@ -0,0 +1,60 @@
+import pathlib
+import pickle
+
+import pytest
+
+import profile_store
+from pad_model import PadModel
+from profile_format import ProfileFormat
+from profile_store import ProfileStore
+
+
+def write_legacy(directory: pathlib.Path, name: str) -> pathlib.Path:
+    path = directory / f"{name}{ProfileFormat.LEGACY_EXTENSION}"
+    path.write_bytes(pickle.dumps((name, PadModel().profile_data)))
+    return path
+
+
+def test_legacy_profile_is_migrated(tmp_path: pathlib.Path) -> None:
+    legacy = write_legacy(tmp_path, "Old")
+    store = ProfileStore(tmp_path)
+    try:
+        assert store.names() == ["Old"]
+        assert store.load("Old")[0] == "Old"
+        assert not legacy.exists()
+    finally:
+        store.close()
+
+
+def test_failed_migration_keeps_legacy_file(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    legacy = write_legacy(tmp_path, "Old")
+
+    def fail(path: pathlib.Path, data: bytes, sync: bool = False) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(profile_store, "replace_file", fail)
+    store = ProfileStore(tmp_path)
+    store.close()
+    assert legacy.exists()
+    monkeypatch.undo()
+    store = ProfileStore(tmp_path)
+    try:
+        assert store.names() == ["Old"]
+        assert not legacy.exists()
+    finally:
+        store.close()
+
+
+def test_legacy_name_collision_is_renamed(tmp_path: pathlib.Path) -> None:
+    store = ProfileStore(tmp_path)
+    store.save("Old", ("Old", PadModel().profile_data))
+    store.close()
+    write_legacy(tmp_path, "Old")
+    store = ProfileStore(tmp_path)
+    try:
+        assert sorted(store.names()) == ["Old", "Old (legacy)"]
+        assert store.load("Old (legacy)")[0] == "Old (legacy)"
+    finally:
+        store.close()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from ring_buffer import ReportRingBuffer
+
+
+@pytest.fixture
+def ring():
+    ring = ReportRingBuffer(4, slots=8)
+    yield ring
+    ring.close()
+
+
+def write_reports(ring: ReportRingBuffer, first: int, count: int) -> None:
+    for value in range(first, first + count):
+        ring.write(bytes([value % 256] * 4))
+
+
+def test_read_returns_reports_in_order(ring: ReportRingBuffer) -> None:
+    for first in (0, 5, 11):
+        write_reports(ring, first, 5)
+        reports, stamps = ring.read()
+        expected = np.arange(first, first + 5).repeat(4).reshape(5, 4)
+        np.testing.assert_array_equal(reports, expected)
+        assert np.all(np.diff(stamps.astype(np.int64)) >= 0)
+    assert ring.lost == 0
+
+
+def test_read_returns_copies(ring: ReportRingBuffer) -> None:
+    write_reports(ring, 0, 3)
+    reports, _ = ring.read()
+    write_reports(ring, 100, 8)
+    np.testing.assert_array_equal(reports[:, 0], [0, 1, 2])
+
+
+def test_lapped_reader_counts_lost_reports(ring: ReportRingBuffer) -> None:
+    write_reports(ring, 0, 20)
+    reports, _ = ring.read()
+    np.testing.assert_array_equal(reports[:, 0], np.arange(12, 20))
+    assert ring.lost == 12
+    assert ring.read()[0].shape == (0, 4)
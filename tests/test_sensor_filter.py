@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from sensor_filter import SensorFilter
+
+SHAPE = (4, 4)
+
+
+def random_samples(seed: int, count: int = 600) -> np.ndarray:
+    generator = np.random.default_rng(seed)
+    steps = generator.integers(-150, 151, (count, *SHAPE))
+    walk = 2000 + np.cumsum(steps, axis=0)
+    return np.clip(walk, 0, 4095).astype(np.int16)
+
+
+def process_blocks(
+    sensor_filter: SensorFilter, samples: np.ndarray, seed: int
+) -> np.ndarray:
+    generator = np.random.default_rng(seed)
+    cuts = np.sort(generator.integers(0, len(samples), 40))
+    blocks = np.split(samples, cuts)
+    return np.concatenate([sensor_filter.process(b) for b in blocks])
+
+
+def median_reference(samples: np.ndarray, size: int) -> np.ndarray:
+    history = [samples[0]] * (size - 1)
+    output = []
+    for row in samples:
+        history.append(row)
+        window = np.stack(history[-size:])
+        output.append(np.rint(np.median(window, axis=0)))
+    return np.array(output)
+
+
+def iir_reference(samples: np.ndarray, alpha: float) -> np.ndarray:
+    state = samples[0].astype(np.float64)
+    output = []
+    for row in samples:
+        state = state + alpha * (row - state)
+        output.append(state)
+    return np.array(output)
+
+
+def slope_reference(samples: np.ndarray, max_step: int) -> np.ndarray:
+    state = samples[0].astype(np.int32)
+    output = []
+    for row in samples:
+        state = np.clip(row, state - max_step, state + max_step)
+        output.append(state)
+    return np.array(output)
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 8])
+def test_median_matches_reference(size: int, seed: int) -> None:
+    samples = random_samples(seed)
+    sensor_filter = SensorFilter.create({"type": "median", "size": size})
+    output = process_blocks(sensor_filter, samples, seed)
+    np.testing.assert_array_equal(output, median_reference(samples, size))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4])
+def test_median_keeps_sample_dtype(size: int) -> None:
+    samples = random_samples(0, 32).astype(np.uint16)
+    sensor_filter = SensorFilter.create({"type": "median", "size": size})
+    assert sensor_filter.process(samples).dtype == np.uint16
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("alpha", [0.05, 0.3, 0.77, 1.0])
+def test_iir_matches_reference(alpha: float, seed: int) -> None:
+    samples = random_samples(seed)
+    sensor_filter = SensorFilter.create({"type": "iir", "alpha": alpha})
+    output = process_blocks(sensor_filter, samples, seed)
+    error = np.abs(output - iir_reference(samples, alpha))
+    assert error.max() <= 0.5 + 1e-6
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("max_step", [1, 16, 64, 200])
+def test_slope_matches_reference(max_step: int, seed: int) -> None:
+    samples = random_samples(seed)
+    config = {"type": "slope", "max_step": max_step}
+    sensor_filter = SensorFilter.create(config)
+    output = process_blocks(sensor_filter, samples, seed)
+    np.testing.assert_array_equal(output, slope_reference(samples, max_step))
+
+
+@pytest.mark.parametrize("config", [
+    {"type": "none"},
+    {"type": "median", "size": 3},
+    {"type": "median", "size": 4},
+    {"type": "median", "size": 9},
+    {"type": "iir", "alpha": 0.05},
+    {"type": "iir", "alpha": 0.3},
+    {"type": "iir", "alpha": 1.0},
+    {"type": "slope", "max_step": 64}
+])
+def test_group_delay_matches_ramp_lag(config: dict) -> None:
+    slope = 2
+    ramp = slope * np.arange(2000).reshape(-1, 1, 1)
+    ramp = np.broadcast_to(ramp, (len(ramp), *SHAPE)).astype(np.int16)
+    sensor_filter = SensorFilter.create(config)
+    output = process_blocks(sensor_filter, ramp, 0)
+    lag = (ramp[-1] - output[-1]) / slope
+    np.testing.assert_allclose(
+        lag, sensor_filter.group_delay, atol=0.5 / slope
+    )
+
+
+@pytest.mark.parametrize("config", [
+    {"type": "median", "size": 5},
+    {"type": "iir", "alpha": 0.2},
+    {"type": "slope", "max_step": 32}
+])
+def test_reset_restarts_from_next_block(config: dict) -> None:
+    samples = random_samples(7)
+    sensor_filter = SensorFilter.create(config)
+    sensor_filter.process(samples[:300])
+    sensor_filter.reset()
+    expected = SensorFilter.create(config).process(samples[300:])
+    np.testing.assert_array_equal(
+        sensor_filter.process(samples[300:]), expected
+    )